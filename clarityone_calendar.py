@@ -12,19 +12,31 @@
 # claritycalendar.py
 
 import sys
+import os
+import re
+import mmap
 import json
 import uuid
-from datetime import datetime
+from bisect import bisect_left, insort
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QCalendarWidget, QListWidget, QListWidgetItem,
     QLineEdit, QTextEdit, QLabel, QComboBox, QMessageBox, QDialog,
-    QFormLayout, QCheckBox, QDateEdit, QAction, QMenu, QTabWidget, QShortcut
+    QFormLayout, QCheckBox, QDateEdit, QAction, QMenu, QTabWidget, QShortcut,
+    QFileDialog
 )
-from PyQt5.QtCore import QDate, Qt
-from PyQt5.QtGui import QColor, QBrush, QKeySequence, QFont
+from PyQt5.QtCore import QDate, Qt, QTimer, QRunnable, QThreadPool
+from PyQt5.QtGui import QColor, QBrush, QKeySequence, QFont, QFontDatabase, QTextCharFormat
+
+try:
+    import orjson  # Much faster JSON parsing and serialization, used when installed
+except ImportError:
+    orjson = None
 
 
 # ---------------------------
@@ -50,39 +62,294 @@ def get_data_file_path():
 
 DATA_FILE = get_data_file_path()
 
+# Changes since data.json was last written are appended here, one JSON record per line,
+# and folded back into data.json once the log grows past LOG_COMPACT_SIZE bytes or on exit.
+# While data.json is rewritten in the background, the log being folded in is set aside
+# as COMPACTING_LOG_FILE and new changes start a fresh log.
+LOG_FILE = DATA_FILE.with_name('ops.log')
+COMPACTING_LOG_FILE = DATA_FILE.with_name('ops.log.compacting')
+LOG_COMPACT_SIZE = 64 * 1024
+
+# Delay after a change before checking whether the log should be compacted (milliseconds)
+COMPACT_DELAY_MS = 250
+
+# Data files larger than this are parsed straight from a memory map (with orjson)
+MMAP_THRESHOLD = 1024 * 1024
+
+# Buffer size for exported files, so the encoder's small chunks reach the disk in few writes
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# Accepted date and time input, as datetime.strptime's "%Y-%m-%d" and "%H:%M" accept it
+DATE_RE = re.compile(r'([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})')
+TIME_RE = re.compile(r'([0-9]{1,2}):([0-9]{1,2})')
+
+# Delay after the last keystroke in a search box before the list is filtered (milliseconds)
+SEARCH_DEBOUNCE_MS = 150
+
+# Application font, used when installed
+APP_FONT_FAMILY = "Charter"
+APP_FONT_SIZE = 14
+
+def decode_json(raw):
+    """
+    Parses JSON bytes, using orjson when it is available.
+    Both parsers raise a json.JSONDecodeError subclass on invalid input.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def encode_json(data, indent=True):
+    """
+    Serializes data to JSON bytes, using orjson when it is available.
+    Indented for readability unless indent is False. Text is written as UTF-8, unescaped, like orjson does.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def write_json_file(data, f):
+    """
+    Writes data to an open binary file as indented JSON.
+    Without orjson the document is encoded chunk by chunk instead of as one large string.
+    """
+    if orjson is not None:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    for chunk in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(data):
+        f.write(chunk.encode('utf-8'))
+
+def read_json_file(f):
+    """
+    Parses an open binary JSON file. Large files are handed to orjson as a memory map,
+    without first copying them into a bytes object.
+    """
+    if orjson is not None and os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+    return decode_json(f.read())
+
 def load_data():
     """
     Loads data from the JSON file.
     If the file does not exist or is corrupted, initializes empty data.
     Also migrates old event data from 'time' to 'start_time'.
+    Changes recorded in the operations log are replayed on top.
     """
-    if not DATA_FILE.exists():
-        # Initialize with empty data
-        return {"events": [], "tasks": []}
-    with open(DATA_FILE, 'r') as f:
-        try:
-            data = json.load(f)
-            # Ensure the keys exist
-            if 'events' not in data:
-                data['events'] = []
-            if 'tasks' not in data:
-                data['tasks'] = []
-            # Migrate events from 'time' to 'start_time' if necessary
-            for event in data['events']:
-                if 'time' in event and 'start_time' not in event:
-                    event['start_time'] = event.pop('time')
-                if 'end_time' not in event:
-                    event['end_time'] = None
-            return data
-        except json.JSONDecodeError:
-            return {"events": [], "tasks": []}
+    data = {"events": [], "tasks": []}
+    if DATA_FILE.exists():
+        with open(DATA_FILE, 'rb') as f:
+            try:
+                data = read_json_file(f)
+                # Ensure the keys exist
+                if 'events' not in data:
+                    data['events'] = []
+                if 'tasks' not in data:
+                    data['tasks'] = []
+                migrate_events(data['events'])
+            except json.JSONDecodeError:
+                data = {"events": [], "tasks": []}
+    replay_log(data)
+    return index_data(data)
+
+def migrate_events(events):
+    """
+    Migrates events from 'time' to 'start_time' if necessary, in a single pass.
+    Every event ends up with a start time and an end_time key.
+    """
+    for event in events:
+        if 'start_time' not in event and 'time' in event:
+            event['start_time'] = event.pop('time')
+        if not event.get('start_time'):
+            event['start_time'] = "00:00"  # Lets event_sort_key read it directly
+        event.setdefault('end_time', None)
+
+def index_data(data):
+    """
+    Adds in-memory lookups of events and tasks by id, kept up to date by the
+    add/edit/delete functions and left out when the data is written to disk.
+    """
+    data['events_by_id'] = {event['id']: event for event in data['events']}
+    data['tasks_by_id'] = {task['id']: task for task in data['tasks']}
+    return data
+
+def stored_data(data):
+    """
+    Returns data as it is written to disk, without the in-memory lookups.
+    """
+    return {key: value for key, value in data.items() if key not in ('events_by_id', 'tasks_by_id')}
 
 def save_data(data):
     """
     Saves data to the JSON file with indentation for readability.
+    The file is replaced atomically, after which the operations logs are no longer needed.
+    """
+    write_data_file(encode_json(stored_data(data)))  # Encoded in full before the file is touched
+    for log_file in (COMPACTING_LOG_FILE, LOG_FILE):
+        if log_file.exists():
+            log_file.unlink()
+
+def write_data_file(content):
+    """
+    Atomically replaces the JSON file with already encoded content.
+    The content is flushed to disk with a single fsync before the rename, so a crash
+    leaves either the old file or the complete new one.
+    """
+    temp_file = DATA_FILE.with_name(DATA_FILE.name + '.tmp')
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(content)  # One write call for the whole file
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, DATA_FILE)
+    except OSError:
+        if temp_file.exists():
+            temp_file.unlink()
+        raise
+
+def compact_data(data):
+    """
+    Folds pending logged changes into the JSON file, if there are any.
+    """
+    if LOG_FILE.exists() or COMPACTING_LOG_FILE.exists():
+        save_data(data)
+
+def append_op(op, payload):
+    """
+    Records a single change in the operations log instead of rewriting the whole file.
+    """
+    with open(LOG_FILE, 'ab') as f:
+        f.write(encode_json({"op": op, "payload": payload}, indent=False) + b"\n")
+
+def replay_log(data):
+    """
+    Applies the changes recorded in the operations logs to data, oldest log first.
+    Replaying is idempotent, so a log left behind by an interrupted compaction is harmless.
     """
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+    torn = False
+    for log_file in (COMPACTING_LOG_FILE, LOG_FILE):
+        if not log_file.exists():
+            continue
+        with open(log_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = decode_json(line)
+                except json.JSONDecodeError:
+                    torn = True  # A write cut short by a crash; nothing after it was recorded
+                    break
+                apply_op(data, record['op'], record['payload'])
+    if torn or COMPACTING_LOG_FILE.exists():
+        # Start a fresh log so new changes are not appended to a torn line,
+        # and finish a compaction that was interrupted
+        save_data(data)
+
+def apply_op(data, op, payload):
+    """
+    Applies one logged change to data.
+    """
+    kind, collection = op.split('_', 1)
+    items = data[collection + 's']
+    if kind == 'delete':
+        data[collection + 's'] = [item for item in items if item['id'] != payload['id']]
+        return
+    for item in items:
+        if item['id'] == payload['id']:
+            item.update(payload)
+            return
+    if kind == 'add':
+        items.append(payload)
+
+def is_valid_date(date_str):
+    """
+    Returns True if date_str is a real calendar date written as YYYY-MM-DD.
+    """
+    match = DATE_RE.fullmatch(date_str)
+    return match is not None and QDate.isValid(*map(int, match.groups()))
+
+def is_valid_time(time_str):
+    """
+    Returns True if time_str is a time of day written as HH:MM.
+    """
+    match = TIME_RE.fullmatch(time_str)
+    return match is not None and int(match.group(1)) <= 23 and int(match.group(2)) <= 59
+
+def is_valid_event(event):
+    """
+    Returns True if event has every field the calendar reads, with a valid date and times.
+    The start time may be missing or still under the old 'time' key, as migrate_events handles both.
+    """
+    if not (isinstance(event, dict)
+            and all(isinstance(event.get(key), str) for key in ('id', 'title', 'date', 'description', 'priority'))):
+        return False
+    start_time = event.get('start_time', event.get('time'))
+    end_time = event.get('end_time')
+    return (is_valid_date(event['date'])
+            and (not start_time or (isinstance(start_time, str) and is_valid_time(start_time)))
+            and (not end_time or (isinstance(end_time, str) and is_valid_time(end_time))))
+
+def is_valid_task(task):
+    """
+    Returns True if task has every field the calendar reads, with a deadline that is None or a valid date.
+    """
+    if not (isinstance(task, dict) and 'deadline' in task
+            and all(isinstance(task.get(key), str) for key in ('id', 'title', 'priority'))):
+        return False
+    deadline = task['deadline']
+    return deadline is None or (isinstance(deadline, str) and is_valid_date(deadline))
+
+def format_time_input(time_input):
+    """
+    Turns HHMM input into HH:MM; any other input is returned stripped, for validation to judge.
+    """
+    time_input = time_input.strip()
+    if len(time_input) == 4 and time_input.isdigit():
+        return time_input[:2] + ":" + time_input[2:]
+    return time_input
+
+@lru_cache(maxsize=None)
+def app_font():
+    """
+    Returns the application font, resolved against the font database on first use.
+    Falls back to the system font family if Charter is not installed.
+    Requires a QApplication to exist.
+    """
+    font_db = QFontDatabase()
+    if APP_FONT_FAMILY in font_db.families():
+        family = APP_FONT_FAMILY
+    else:
+        family = QFontDatabase.systemFont(QFontDatabase.GeneralFont).family()
+    font = QFont(family, APP_FONT_SIZE)
+    font.setStyleStrategy(QFont.PreferAntialias)
+    return font
+
+@lru_cache(maxsize=4096)
+def parse_qdate(date_str):
+    """
+    Parses a "YYYY-MM-DD" string into a QDate, reusing earlier results.
+    Invalid strings give an invalid QDate. The result is shared, so callers must not modify it.
+    """
+    return QDate.fromString(date_str, "yyyy-MM-dd")
+
+# Sort key placing events in chronological order (by date and start time), with the id
+# breaking ties so every key is unique. Events always have a start time once loaded.
+event_sort_key = itemgetter('date', 'start_time', 'id')
+
+def task_sort_key(task):
+    """
+    Sort key placing tasks by deadline, with tasks without a deadline last.
+    The id breaks ties, so every key is unique.
+    """
+    return (task['deadline'] is None, task['deadline'] or "", task['id'])
+
+def remove_sort_key(sort_keys, key):
+    """
+    Removes a key from a sorted list of keys.
+    """
+    index = bisect_left(sort_keys, key)
+    if index < len(sort_keys) and sort_keys[index] == key:
+        del sort_keys[index]
 
 
 # ---------------------------
@@ -94,7 +361,7 @@ def add_event(data, title, date, start_time, end_time, description, priority):
     Adds a new event to the data.
     """
     event = {
-        "id": str(uuid.uuid4()),
+        "id": uuid.uuid4().hex,
         "title": title,
         "date": date,
         "start_time": start_time,
@@ -103,30 +370,32 @@ def add_event(data, title, date, start_time, end_time, description, priority):
         "priority": priority
     }
     data['events'].append(event)
-    save_data(data)
+    data['events_by_id'][event['id']] = event
+    append_op('add_event', event)
     return event
 
 def edit_event(data, event_id, title, date, start_time, end_time, description, priority):
     """
     Edits an existing event identified by event_id.
     """
-    for event in data['events']:
-        if event['id'] == event_id:
-            event['title'] = title
-            event['date'] = date
-            event['start_time'] = start_time
-            event['end_time'] = end_time
-            event['description'] = description
-            event['priority'] = priority
-            break
-    save_data(data)
+    event = data['events_by_id'].get(event_id)
+    if event is not None:
+        event['title'] = title
+        event['date'] = date
+        event['start_time'] = start_time
+        event['end_time'] = end_time
+        event['description'] = description
+        event['priority'] = priority
+        append_op('edit_event', event)
 
 def delete_event(data, event_id):
     """
     Deletes an event identified by event_id.
     """
-    data['events'] = [event for event in data['events'] if event['id'] != event_id]
-    save_data(data)
+    event = data['events_by_id'].pop(event_id, None)
+    if event is not None:
+        data['events'].remove(event)
+        append_op('delete_event', {"id": event_id})
 
 
 # ---------------------------
@@ -138,39 +407,58 @@ def add_task(data, title, deadline, priority):
     Adds a new task to the data.
     """
     task = {
-        "id": str(uuid.uuid4()),
+        "id": uuid.uuid4().hex,
         "title": title,
         "deadline": deadline,  # Can be None
         "priority": priority
     }
     data['tasks'].append(task)
-    save_data(data)
+    data['tasks_by_id'][task['id']] = task
+    append_op('add_task', task)
     return task
 
 def edit_task(data, task_id, title, deadline, priority):
     """
     Edits an existing task identified by task_id.
     """
-    for task in data['tasks']:
-        if task['id'] == task_id:
-            task['title'] = title
-            task['deadline'] = deadline  # Can be None
-            task['priority'] = priority
-            break
-    save_data(data)
+    task = data['tasks_by_id'].get(task_id)
+    if task is not None:
+        task['title'] = title
+        task['deadline'] = deadline  # Can be None
+        task['priority'] = priority
+        append_op('edit_task', task)
 
 def delete_task(data, task_id):
     """
     Deletes a task identified by task_id.
     """
-    data['tasks'] = [task for task in data['tasks'] if task['id'] != task_id]
-    save_data(data)
+    task = data['tasks_by_id'].pop(task_id, None)
+    if task is not None:
+        data['tasks'].remove(task)
+        append_op('delete_task', {"id": task_id})
 
 
 # ---------------------------
 # Dialogs for Adding/Editing
 # ---------------------------
 
+class CompactDataJob(QRunnable):
+    """
+    Writes an encoded snapshot of the data to the JSON file on the thread pool,
+    then deletes the log it replaces.
+    """
+    def __init__(self, content):
+        super().__init__()
+        self.content = content
+    
+    def run(self):
+        try:
+            write_data_file(self.content)
+            COMPACTING_LOG_FILE.unlink()
+        except OSError:
+            pass  # The set-aside log is kept and replayed on the next start
+
+
 class AddEditEventDialog(QDialog):
     """
     Dialog for adding or editing an event.
@@ -199,7 +487,7 @@ class AddEditEventDialog(QDialog):
 
         if self.event:
             self.title_edit.setText(self.event['title'])
-            self.date_edit.setDate(QDate.fromString(self.event['date'], "yyyy-MM-dd"))
+            self.date_edit.setDate(parse_qdate(self.event['date']))
             self.start_time_edit.setText(self.event['start_time'].replace(":", ""))  # Remove colon for input
             if self.event.get('end_time'):
                 self.end_time_edit.setText(self.event['end_time'].replace(":", ""))
@@ -237,21 +525,9 @@ class AddEditEventDialog(QDialog):
         """
         Retrieves the data entered by the user.
         """
-        # Parse start time input
-        start_time_input = self.start_time_edit.text().strip()
-        if len(start_time_input) == 4 and start_time_input.isdigit():
-            start_time_formatted = f"{start_time_input[:2]}:{start_time_input[2:]}"
-        else:
-            start_time_formatted = self.start_time_edit.text().strip()
-        
-        # Parse end time input
-        end_time_input = self.end_time_edit.text().strip()
-        if len(end_time_input) == 4 and end_time_input.isdigit():
-            end_time_formatted = f"{end_time_input[:2]}:{end_time_input[2:]}"
-        elif end_time_input == "":
-            end_time_formatted = None
-        else:
-            end_time_formatted = end_time_input.strip()
+        # Parse time inputs; an empty end time means there is none
+        start_time_formatted = format_time_input(self.start_time_edit.text())
+        end_time_formatted = format_time_input(self.end_time_edit.text()) or None
 
         return {
             "title": self.title_edit.text(),
@@ -291,7 +567,7 @@ class AddEditTaskDialog(QDialog):
             self.title_edit.setText(self.task['title'])
             if self.task.get('deadline'):
                 self.deadline_checkbox.setChecked(True)
-                deadline_date = QDate.fromString(self.task['deadline'], "yyyy-MM-dd")
+                deadline_date = parse_qdate(self.task['deadline'])
                 self.deadline_edit.setDate(deadline_date if deadline_date.isValid() else QDate.currentDate())
                 self.deadline_edit.setEnabled(True)
             index = self.priority_combo.findText(self.task['priority'])
@@ -350,6 +626,15 @@ class ClarityCalendar(QMainWindow):
         self.setWindowTitle("Clarity Calendar")
         self.setGeometry(100, 100, 1300, 800)  # Increased width for better layout
         self.data = load_data()
+        self.highlighted_dates = set()  # Dates currently shown as having events
+        self.data_version = 0  # Bumped on every change to the data
+        self.last_export = None  # Export state of the last file written by export_data
+        self.message_box = None  # Non-blocking message box for import and export results, created on first use
+        # Compaction of the change log is checked once changes pause, and runs in the background
+        self.compact_timer = QTimer(self)
+        self.compact_timer.setSingleShot(True)
+        self.compact_timer.setInterval(COMPACT_DELAY_MS)
+        self.compact_timer.timeout.connect(self.start_compaction)
         self.init_ui()
         self.setup_shortcuts()
         self.apply_palatino_font()
@@ -357,9 +642,12 @@ class ClarityCalendar(QMainWindow):
     def apply_palatino_font(self):
         """
         Applies Palatino font to the entire application.
+        Skipped when it is already set, as an application-wide font change restyles every widget.
         """
-        font = QFont("Charter", 14)
-        QApplication.instance().setFont(font)
+        font = app_font()
+        app = QApplication.instance()
+        if app.font() != font:
+            app.setFont(font)
     
     def init_ui(self):
         """
@@ -404,7 +692,9 @@ class ClarityCalendar(QMainWindow):
         # Ensure the default navigation bar is visible
         self.calendar.setNavigationBarVisible(True)
         
-        # Styling the Month and Year Dropdowns
+        # Styling the Month and Year Dropdowns, looked up once and kept for reuse
+        self.month_combo = self.calendar.findChild(QComboBox, "monthCombo")
+        self.year_combo = self.calendar.findChild(QComboBox, "yearCombo")
         self.style_calendar_nav()
 
         nav_layout.addWidget(self.calendar)
@@ -426,7 +716,11 @@ class ClarityCalendar(QMainWindow):
         search_label_events = QLabel("Search Events:")
         self.search_events = QLineEdit()
         self.search_events.setPlaceholderText("Enter event title or description...")
-        self.search_events.textChanged.connect(self.populate_all_events)
+        self.events_search_timer = QTimer(self)
+        self.events_search_timer.setSingleShot(True)
+        self.events_search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.events_search_timer.timeout.connect(self.filter_events)
+        self.search_events.textChanged.connect(self.events_search_timer.start)  # Filter once typing pauses
         search_layout_events.addWidget(search_label_events)
         search_layout_events.addWidget(self.search_events)
         events_layout.addLayout(search_layout_events)
@@ -434,6 +728,7 @@ class ClarityCalendar(QMainWindow):
         events_label = QLabel("All Events:")
         events_layout.addWidget(events_label)
         self.events_list = QListWidget()
+        self.events_list.setUniformItemSizes(True)  # Single-line rows, so large lists skip per-row measuring
         self.events_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.events_list.customContextMenuRequested.connect(self.event_context_menu)
         events_layout.addWidget(self.events_list)
@@ -449,7 +744,11 @@ class ClarityCalendar(QMainWindow):
         search_label_tasks = QLabel("Search Tasks:")
         self.search_tasks = QLineEdit()
         self.search_tasks.setPlaceholderText("Enter task title...")
-        self.search_tasks.textChanged.connect(self.populate_all_tasks)
+        self.tasks_search_timer = QTimer(self)
+        self.tasks_search_timer.setSingleShot(True)
+        self.tasks_search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.tasks_search_timer.timeout.connect(self.filter_tasks)
+        self.search_tasks.textChanged.connect(self.tasks_search_timer.start)  # Filter once typing pauses
         search_layout_tasks.addWidget(search_label_tasks)
         search_layout_tasks.addWidget(self.search_tasks)
         todo_layout.addLayout(search_layout_tasks)
@@ -457,6 +756,7 @@ class ClarityCalendar(QMainWindow):
         todo_label = QLabel("To-Do List:")
         todo_layout.addWidget(todo_label)
         self.todo_list = QListWidget()
+        self.todo_list.setUniformItemSizes(True)  # Single-line rows, so large lists skip per-row measuring
         self.todo_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.todo_list.customContextMenuRequested.connect(self.todo_context_menu)
         todo_layout.addWidget(self.todo_list)
@@ -468,6 +768,7 @@ class ClarityCalendar(QMainWindow):
         
         # Menu Bar for Additional Features
         self.create_menu()
+        self.create_context_menus()
         
         self.refresh_views()
     
@@ -511,13 +812,10 @@ class ClarityCalendar(QMainWindow):
             }
         """
         # Apply the stylesheet to the QCalendarWidget's month and year comboboxes
-        month_combo = self.calendar.findChild(QComboBox, "monthCombo")
-        year_combo = self.calendar.findChild(QComboBox, "yearCombo")
-        
-        if month_combo:
-            month_combo.setStyleSheet(combo_style)
-        if year_combo:
-            year_combo.setStyleSheet(combo_style)
+        if self.month_combo:
+            self.month_combo.setStyleSheet(combo_style)
+        if self.year_combo:
+            self.year_combo.setStyleSheet(combo_style)
     
     def create_menu(self):
         """
@@ -538,6 +836,30 @@ class ClarityCalendar(QMainWindow):
         import_action.triggered.connect(self.import_data)
         file_menu.addAction(import_action)
     
+    def create_context_menus(self):
+        """
+        Creates the right-click menus for events, tasks and the calendar once, to be reused on every click.
+        """
+        # Events Menu
+        self.event_menu = QMenu(self)
+        self.edit_event_action = QAction("Edit Event", self)
+        self.delete_event_action = QAction("Delete Event", self)
+        self.event_menu.addAction(self.edit_event_action)
+        self.event_menu.addAction(self.delete_event_action)
+        
+        # Tasks Menu
+        self.task_menu = QMenu(self)
+        self.edit_task_action = QAction("Edit Task", self)
+        self.delete_task_action = QAction("Delete Task", self)
+        self.task_menu.addAction(self.edit_task_action)
+        self.task_menu.addAction(self.delete_task_action)
+        
+        # Calendar Menu, reading the selected date when the action is triggered
+        self.calendar_menu = QMenu(self)
+        add_event_action = QAction("Add Event to Selected Date", self)
+        add_event_action.triggered.connect(self.add_event_to_selected_date)
+        self.calendar_menu.addAction(add_event_action)
+    
     def setup_shortcuts(self):
         """
         Sets up keyboard shortcuts for various actions.
@@ -566,75 +888,195 @@ class ClarityCalendar(QMainWindow):
     def refresh_views(self):
         """
         Refreshes the calendar highlights, events list, and to-do list.
+        The window repaints once, after all of them are rebuilt.
         """
-        self.populate_all_events()
-        self.populate_all_tasks()
-        self.highlight_calendar()
-        self.style_calendar_nav()  # Re-apply styles in case of view changes
+        self.setUpdatesEnabled(False)
+        try:
+            self.index_views()
+            self.populate_all_events()
+            self.populate_all_tasks()
+            self.highlight_calendar()
+        finally:
+            self.setUpdatesEnabled(True)
     
     def populate_all_events(self):
         """
         Populates the events list with all events, sorted chronologically.
-        Applies search filter if any.
+        Events not matching the search filter are hidden.
         """
-        self.events_list.clear()
-        search_query = self.search_events.text().lower()
-        # Sort events by date and start time
-        sorted_events = sorted(
-            self.data['events'],
-            key=lambda e: (e['date'], e.get('start_time') or "00:00")
-        )
-        for event in sorted_events:
-            if (search_query in event['title'].lower()) or (search_query in event['description'].lower()):
-                end_time_display = f" - {event['end_time']}" if event.get('end_time') else ""
-                item_text = f"{event['date']} {event.get('start_time', '00:00')}{end_time_display} - {event['title']} (Priority: {event['priority']})"
-                item = QListWidgetItem(item_text)
-                # Store event ID in the item for easy access
-                item.setData(Qt.UserRole, event['id'])
+        self.events_list.setUpdatesEnabled(False)
+        try:
+            self.events_list.clear()
+            self.event_items = {}  # Event ID -> its list item, for targeted updates
+            search_query = self.search_events.text().lower()
+            # Events are kept in order of date and start time
+            events_by_id = self.data['events_by_id']
+            for key in self.event_sort_keys:
+                event = events_by_id[key[-1]]
+                item = self.create_event_item(event)
                 self.events_list.addItem(item)
+                item.setHidden(not self.event_matches(event, search_query))  # Only takes effect once in the list
+        finally:
+            self.events_list.setUpdatesEnabled(True)
     
     def populate_all_tasks(self):
         """
         Populates the to-do list with all tasks, sorted chronologically.
-        Applies search filter if any.
+        Tasks not matching the search filter are hidden.
         """
-        self.todo_list.clear()
-        search_query = self.search_tasks.text().lower()
-        # Sort tasks by deadline; tasks without deadlines come last
-        sorted_tasks = sorted(
-            self.data['tasks'],
-            key=lambda t: (t['deadline'] is None, t['deadline'])
-        )
-        for task in sorted_tasks:
-            if search_query in task['title'].lower():
-                if task['deadline']:
-                    item_text = f"{task['deadline']} - {task['title']} (Priority: {task['priority']})"
-                else:
-                    item_text = f"No Deadline - {task['title']} (Priority: {task['priority']})"
-                item = QListWidgetItem(item_text)
-                # Store task ID in the item for easy access
-                item.setData(Qt.UserRole, task['id'])
+        self.todo_list.setUpdatesEnabled(False)
+        try:
+            self.todo_list.clear()
+            self.task_items = {}  # Task ID -> its list item, for targeted updates
+            search_query = self.search_tasks.text().lower()
+            # Tasks are kept in order of deadline; tasks without deadlines come last
+            tasks_by_id = self.data['tasks_by_id']
+            for key in self.task_sort_keys:
+                task = tasks_by_id[key[-1]]
+                item = self.create_task_item(task)
                 self.todo_list.addItem(item)
+                item.setHidden(not self.task_matches(task, search_query))  # Only takes effect once in the list
+        finally:
+            self.todo_list.setUpdatesEnabled(True)
+    
+    def create_event_item(self, event):
+        """
+        Creates the list item for an event.
+        """
+        end_time_display = f" - {event['end_time']}" if event.get('end_time') else ""
+        item_text = f"{event['date']} {event.get('start_time', '00:00')}{end_time_display} - {event['title']} (Priority: {event['priority']})"
+        item = QListWidgetItem(item_text)
+        # Store event ID in the item for easy access
+        item.setData(Qt.UserRole, event['id'])
+        self.event_items[event['id']] = item
+        return item
+    
+    def create_task_item(self, task):
+        """
+        Creates the list item for a task.
+        """
+        if task['deadline']:
+            item_text = f"{task['deadline']} - {task['title']} (Priority: {task['priority']})"
+        else:
+            item_text = f"No Deadline - {task['title']} (Priority: {task['priority']})"
+        item = QListWidgetItem(item_text)
+        # Store task ID in the item for easy access
+        item.setData(Qt.UserRole, task['id'])
+        self.task_items[task['id']] = item
+        return item
+    
+    def event_matches(self, event, search_query):
+        """
+        Returns True if the event's title or description contains the search query.
+        """
+        return (search_query in event['title'].lower()) or (search_query in event['description'].lower())
+    
+    def task_matches(self, task, search_query):
+        """
+        Returns True if the task's title contains the search query.
+        """
+        return search_query in task['title'].lower()
+    
+    def filter_events(self):
+        """
+        Shows only the events matching the search filter, without rebuilding the list.
+        """
+        search_query = self.search_events.text().lower()
+        events_by_id = self.data['events_by_id']
+        self.events_list.setUpdatesEnabled(False)
+        for event_id, item in self.event_items.items():
+            item.setHidden(not self.event_matches(events_by_id[event_id], search_query))
+        self.events_list.setUpdatesEnabled(True)
+    
+    def filter_tasks(self):
+        """
+        Shows only the tasks matching the search filter, without rebuilding the list.
+        """
+        search_query = self.search_tasks.text().lower()
+        tasks_by_id = self.data['tasks_by_id']
+        self.todo_list.setUpdatesEnabled(False)
+        for task_id, item in self.task_items.items():
+            item.setHidden(not self.task_matches(tasks_by_id[task_id], search_query))
+        self.todo_list.setUpdatesEnabled(True)
+    
+    def insert_event_item(self, event):
+        """
+        Adds the list item for an event at its place in the list.
+        Its sort key must already be in event_sort_keys.
+        """
+        row = bisect_left(self.event_sort_keys, event_sort_key(event))
+        item = self.create_event_item(event)
+        self.events_list.insertItem(row, item)
+        item.setHidden(not self.event_matches(event, self.search_events.text().lower()))
+    
+    def insert_task_item(self, task):
+        """
+        Adds the list item for a task at its place in the list.
+        Its sort key must already be in task_sort_keys.
+        """
+        row = bisect_left(self.task_sort_keys, task_sort_key(task))
+        item = self.create_task_item(task)
+        self.todo_list.insertItem(row, item)
+        item.setHidden(not self.task_matches(task, self.search_tasks.text().lower()))
+    
+    def remove_event_item(self, event_id):
+        """
+        Removes the list item for an event.
+        """
+        item = self.event_items.pop(event_id, None)
+        if item is not None:
+            self.events_list.takeItem(self.events_list.row(item))
+    
+    def remove_task_item(self, task_id):
+        """
+        Removes the list item for a task.
+        """
+        item = self.task_items.pop(task_id, None)
+        if item is not None:
+            self.todo_list.takeItem(self.todo_list.row(item))
     
     def highlight_calendar(self):
         """
         Highlights dates that have events with light blue color.
         """
-        # Reset all date formats
-        default_format = self.calendar.dateTextFormat(QDate())
-        default_format.setBackground(Qt.white)
-        self.calendar.setDateTextFormat(QDate(), default_format)
+        # Only dates whose highlight changes are touched, and the calendar repaints once
+        event_dates = set(self.event_date_counts)  # Kept up to date as events change
+        self.calendar.setUpdatesEnabled(False)
         
-        # Collect all dates with events
-        dates_with_events = {event['date'] for event in self.data['events']}
+        # Reset dates that no longer have events
+        for date_str in self.highlighted_dates - event_dates:
+            date_obj = parse_qdate(date_str)
+            if date_obj.isValid():
+                self.calendar.setDateTextFormat(date_obj, QTextCharFormat())
         
-        # Highlight these dates
-        for date_str in dates_with_events:
-            date_obj = QDate.fromString(date_str, "yyyy-MM-dd")
+        # Highlight dates that now have events
+        for date_str in event_dates - self.highlighted_dates:
+            date_obj = parse_qdate(date_str)
             if date_obj.isValid():
                 fmt = self.calendar.dateTextFormat(date_obj)
                 fmt.setBackground(QBrush(QColor("#44a6c6")))  # Light Blue color
                 self.calendar.setDateTextFormat(date_obj, fmt)
+        
+        self.highlighted_dates = event_dates
+        self.calendar.setUpdatesEnabled(True)
+    
+    def index_views(self):
+        """
+        Builds what the views are drawn from: the events and tasks in display order
+        (as sort keys) and the number of events on each date.
+        These are kept up to date as events and tasks change.
+        """
+        self.event_sort_keys = sorted(map(event_sort_key, self.data['events']))
+        self.task_sort_keys = sorted(map(task_sort_key, self.data['tasks']))
+        self.event_date_counts = Counter(event['date'] for event in self.data['events'])
+    
+    def change_event_date_count(self, date_str, change):
+        """
+        Adjusts the number of events on a date, forgetting dates that have none left.
+        """
+        self.event_date_counts[date_str] += change
+        if self.event_date_counts[date_str] <= 0:
+            del self.event_date_counts[date_str]
     
     def add_event(self, preselected_date=None):
         """
@@ -649,16 +1091,13 @@ class ClarityCalendar(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             event_data = dialog.get_data()
             # Basic validation
-            try:
-                datetime.strptime(event_data['date'], "%Y-%m-%d")
-                datetime.strptime(event_data['start_time'], "%H:%M")
-                if event_data['end_time']:
-                    datetime.strptime(event_data['end_time'], "%H:%M")
-            except ValueError:
+            if not (is_valid_date(event_data['date'])
+                    and is_valid_time(event_data['start_time'])
+                    and (not event_data['end_time'] or is_valid_time(event_data['end_time']))):
                 QMessageBox.warning(self, "Invalid Input", "Please enter valid date and time formats.")
                 return
             # Add event
-            add_event(
+            event = add_event(
                 self.data,
                 event_data['title'],
                 event_data['date'],
@@ -667,7 +1106,11 @@ class ClarityCalendar(QMainWindow):
                 event_data['description'],
                 event_data['priority']
             )
-            self.refresh_views()
+            insort(self.event_sort_keys, event_sort_key(event))
+            self.insert_event_item(event)
+            self.change_event_date_count(event_data['date'], 1)
+            self.highlight_calendar()
+            self.schedule_compaction()
             QMessageBox.information(self, "Success", "Event added successfully.")
     
     def add_task(self):
@@ -678,20 +1121,19 @@ class ClarityCalendar(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             task_data = dialog.get_data()
             # Basic validation
-            if task_data['deadline']:
-                try:
-                    datetime.strptime(task_data['deadline'], "%Y-%m-%d")
-                except ValueError:
-                    QMessageBox.warning(self, "Invalid Input", "Please enter a valid deadline format (YYYY-MM-DD).")
-                    return
+            if task_data['deadline'] and not is_valid_date(task_data['deadline']):
+                QMessageBox.warning(self, "Invalid Input", "Please enter a valid deadline format (YYYY-MM-DD).")
+                return
             # Add task
-            add_task(
+            task = add_task(
                 self.data,
                 task_data['title'],
                 task_data['deadline'],
                 task_data['priority']
             )
-            self.refresh_views()
+            insort(self.task_sort_keys, task_sort_key(task))
+            self.insert_task_item(task)
+            self.schedule_compaction()
             QMessageBox.information(self, "Success", "Task added successfully.")
     
     def edit_event(self, item):
@@ -699,7 +1141,7 @@ class ClarityCalendar(QMainWindow):
         Edits an event based on the selected item.
         """
         event_id = item.data(Qt.UserRole)
-        event = next((e for e in self.data['events'] if e['id'] == event_id), None)
+        event = self.data['events_by_id'].get(event_id)
         if not event:
             QMessageBox.warning(self, "Event Not Found", "Selected event could not be found.")
             return
@@ -707,15 +1149,15 @@ class ClarityCalendar(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             event_data = dialog.get_data()
             # Basic validation
-            try:
-                datetime.strptime(event_data['date'], "%Y-%m-%d")
-                datetime.strptime(event_data['start_time'], "%H:%M")
-                if event_data['end_time']:
-                    datetime.strptime(event_data['end_time'], "%H:%M")
-            except ValueError:
+            if not (is_valid_date(event_data['date'])
+                    and is_valid_time(event_data['start_time'])
+                    and (not event_data['end_time'] or is_valid_time(event_data['end_time']))):
                 QMessageBox.warning(self, "Invalid Input", "Please enter valid date and time formats.")
                 return
             # Edit event
+            remove_sort_key(self.event_sort_keys, event_sort_key(event))
+            self.change_event_date_count(event['date'], -1)
+            self.change_event_date_count(event_data['date'], 1)
             edit_event(
                 self.data,
                 event_id,
@@ -726,7 +1168,12 @@ class ClarityCalendar(QMainWindow):
                 event_data['description'],
                 event_data['priority']
             )
-            self.refresh_views()
+            insort(self.event_sort_keys, event_sort_key(event))
+            # The edit may move the event, so its item is put back at its new place
+            self.remove_event_item(event_id)
+            self.insert_event_item(event)
+            self.highlight_calendar()
+            self.schedule_compaction()
             QMessageBox.information(self, "Success", "Event edited successfully.")
     
     def delete_event(self, item):
@@ -734,7 +1181,7 @@ class ClarityCalendar(QMainWindow):
         Deletes an event based on the selected item.
         """
         event_id = item.data(Qt.UserRole)
-        event = next((e for e in self.data['events'] if e['id'] == event_id), None)
+        event = self.data['events_by_id'].get(event_id)
         if not event:
             QMessageBox.warning(self, "Event Not Found", "Selected event could not be found.")
             return
@@ -746,7 +1193,11 @@ class ClarityCalendar(QMainWindow):
         )
         if reply == QMessageBox.Yes:
             delete_event(self.data, event_id)
-            self.refresh_views()
+            remove_sort_key(self.event_sort_keys, event_sort_key(event))
+            self.remove_event_item(event_id)
+            self.change_event_date_count(event['date'], -1)
+            self.highlight_calendar()
+            self.schedule_compaction()
             QMessageBox.information(self, "Success", "Event deleted successfully.")
     
     def edit_task(self, item):
@@ -754,7 +1205,7 @@ class ClarityCalendar(QMainWindow):
         Edits a task based on the selected item.
         """
         task_id = item.data(Qt.UserRole)
-        task = next((t for t in self.data['tasks'] if t['id'] == task_id), None)
+        task = self.data['tasks_by_id'].get(task_id)
         if not task:
             QMessageBox.warning(self, "Task Not Found", "Selected task could not be found.")
             return
@@ -762,13 +1213,11 @@ class ClarityCalendar(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             task_data = dialog.get_data()
             # Basic validation
-            if task_data['deadline']:
-                try:
-                    datetime.strptime(task_data['deadline'], "%Y-%m-%d")
-                except ValueError:
-                    QMessageBox.warning(self, "Invalid Input", "Please enter a valid deadline format (YYYY-MM-DD).")
-                    return
+            if task_data['deadline'] and not is_valid_date(task_data['deadline']):
+                QMessageBox.warning(self, "Invalid Input", "Please enter a valid deadline format (YYYY-MM-DD).")
+                return
             # Edit task
+            remove_sort_key(self.task_sort_keys, task_sort_key(task))
             edit_task(
                 self.data,
                 task_id,
@@ -776,7 +1225,11 @@ class ClarityCalendar(QMainWindow):
                 task_data['deadline'],
                 task_data['priority']
             )
-            self.refresh_views()
+            insort(self.task_sort_keys, task_sort_key(task))
+            # The edit may move the task, so its item is put back at its new place
+            self.remove_task_item(task_id)
+            self.insert_task_item(task)
+            self.schedule_compaction()
             QMessageBox.information(self, "Success", "Task edited successfully.")
     
     def delete_task(self, item):
@@ -784,7 +1237,7 @@ class ClarityCalendar(QMainWindow):
         Deletes a task based on the selected item.
         """
         task_id = item.data(Qt.UserRole)
-        task = next((t for t in self.data['tasks'] if t['id'] == task_id), None)
+        task = self.data['tasks_by_id'].get(task_id)
         if not task:
             QMessageBox.warning(self, "Task Not Found", "Selected task could not be found.")
             return
@@ -796,53 +1249,76 @@ class ClarityCalendar(QMainWindow):
         )
         if reply == QMessageBox.Yes:
             delete_task(self.data, task_id)
-            self.refresh_views()
+            remove_sort_key(self.task_sort_keys, task_sort_key(task))
+            self.remove_task_item(task_id)
+            self.schedule_compaction()
             QMessageBox.information(self, "Success", "Task deleted successfully.")
     
     def event_context_menu(self, position):
         """
-        Creates a context menu for events.
+        Shows the context menu for events.
         """
         item = self.events_list.itemAt(position)
         if item:
-            menu = QMenu()
-            edit_action = QAction("Edit Event", self)
-            delete_action = QAction("Delete Event", self)
-            menu.addAction(edit_action)
-            menu.addAction(delete_action)
-            action = menu.exec_(self.events_list.mapToGlobal(position))
-            if action == edit_action:
+            action = self.event_menu.exec_(self.events_list.mapToGlobal(position))
+            if action == self.edit_event_action:
                 self.edit_event(item)
-            elif action == delete_action:
+            elif action == self.delete_event_action:
                 self.delete_event(item)
     
     def todo_context_menu(self, position):
         """
-        Creates a context menu for tasks.
+        Shows the context menu for tasks.
         """
         item = self.todo_list.itemAt(position)
         if item:
-            menu = QMenu()
-            edit_action = QAction("Edit Task", self)
-            delete_action = QAction("Delete Task", self)
-            menu.addAction(edit_action)
-            menu.addAction(delete_action)
-            action = menu.exec_(self.todo_list.mapToGlobal(position))
-            if action == edit_action:
+            action = self.task_menu.exec_(self.todo_list.mapToGlobal(position))
+            if action == self.edit_task_action:
                 self.edit_task(item)
-            elif action == delete_action:
+            elif action == self.delete_task_action:
                 self.delete_task(item)
     
     def calendar_context_menu(self, position):
         """
-        Creates a context menu for the calendar to add events directly to a date.
+        Shows the context menu for the calendar to add events directly to a date.
         """
-        date = self.calendar.selectedDate()
-        menu = QMenu()
-        add_event_action = QAction("Add Event to Selected Date", self)
-        add_event_action.triggered.connect(lambda: self.add_event(preselected_date=date))
-        menu.addAction(add_event_action)
-        menu.exec_(self.calendar.mapToGlobal(position))
+        self.calendar_menu.exec_(self.calendar.mapToGlobal(position))
+    
+    def add_event_to_selected_date(self):
+        """
+        Adds an event on the date selected in the calendar.
+        """
+        self.add_event(preselected_date=self.calendar.selectedDate())
+    
+    def schedule_compaction(self):
+        """
+        Checks the change log size shortly after changes stop, coalescing bursts of edits.
+        Called after every change to the data.
+        """
+        self.data_version += 1
+        self.compact_timer.start()
+    
+    def start_compaction(self):
+        """
+        Rewrites the data file on the thread pool once the change log has grown too large.
+        The data is encoded here, so the background write sees a consistent snapshot.
+        """
+        if COMPACTING_LOG_FILE.exists():
+            return  # A compaction is still running
+        if not LOG_FILE.exists() or LOG_FILE.stat().st_size <= LOG_COMPACT_SIZE:
+            return
+        content = encode_json(stored_data(self.data))
+        os.replace(LOG_FILE, COMPACTING_LOG_FILE)  # Later changes go to a fresh log
+        QThreadPool.globalInstance().start(CompactDataJob(content))
+    
+    def closeEvent(self, event):
+        """
+        Folds logged changes into the data file before the window closes.
+        """
+        self.compact_timer.stop()
+        QThreadPool.globalInstance().waitForDone()  # Let a background compaction finish first
+        compact_data(self.data)
+        event.accept()
     
     def reset_calendar_view(self):
         """
@@ -852,47 +1328,74 @@ class ClarityCalendar(QMainWindow):
         self.calendar.setSelectedDate(today)
         self.calendar.showSelectedDate()
     
+    def show_message(self, icon, title, text):
+        """
+        Shows a message without blocking the event loop, so the window keeps repainting
+        while it is open. The same message box is reused for every message.
+        """
+        if self.message_box is None:
+            self.message_box = QMessageBox(QMessageBox.NoIcon, "", "", QMessageBox.Ok, self)
+            self.message_box.setModal(False)
+        self.message_box.setIcon(icon)
+        self.message_box.setWindowTitle(title)
+        self.message_box.setText(text)
+        self.message_box.show()
+    
     def export_data(self):
         """
         Exports the current data to a user-specified JSON file.
         """
-        from PyQt5.QtWidgets import QFileDialog
-        options = QFileDialog.Options()
-        file_path, _ = QFileDialog.getSaveFileName(self, "Export Data", "", "JSON Files (*.json)", options=options)
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Data", "", "JSON Files (*.json)")
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(self.data, f, indent=4)
-                QMessageBox.information(self, "Export Successful", f"Data exported to {file_path}")
+                export_state = self.export_state(file_path)
+                # Unchanged data already exported to an untouched file is not written again
+                if export_state is None or export_state != self.last_export:
+                    with open(file_path, 'wb', buffering=EXPORT_BUFFER_SIZE) as f:
+                        write_json_file(stored_data(self.data), f)
+                    self.last_export = self.export_state(file_path)
+                self.show_message(QMessageBox.Information, "Export Successful", f"Data exported to {file_path}")
             except Exception as e:
-                QMessageBox.warning(self, "Export Failed", f"An error occurred: {str(e)}")
+                self.show_message(QMessageBox.Warning, "Export Failed", f"An error occurred: {str(e)}")
+    
+    def export_state(self, file_path):
+        """
+        Identifies an exported file by its path, size and modification time, along with
+        the version of the data. Returns None if the file does not exist.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (file_path, self.data_version, stat.st_size, stat.st_mtime_ns)
     
     def import_data(self):
         """
         Imports data from a user-specified JSON file.
         """
-        from PyQt5.QtWidgets import QFileDialog
-        options = QFileDialog.Options()
-        file_path, _ = QFileDialog.getOpenFileName(self, "Import Data", "", "JSON Files (*.json)", options=options)
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Data", "", "JSON Files (*.json)")
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    imported_data = json.load(f)
+                with open(file_path, 'rb') as f:
+                    imported_data = read_json_file(f)  # Memory mapped when the file is large
+                # Check the format of every item before anything is migrated or saved
+                if not (isinstance(imported_data, dict)
+                        and isinstance(imported_data.get('events'), list)
+                        and isinstance(imported_data.get('tasks'), list)
+                        and all(map(is_valid_event, imported_data['events']))
+                        and all(map(is_valid_task, imported_data['tasks']))):
+                    self.show_message(QMessageBox.Warning, "Import Failed", "Invalid data format.")
+                    return
                 # Migrate imported data if necessary
-                if 'events' in imported_data and 'tasks' in imported_data:
-                    for event in imported_data['events']:
-                        if 'time' in event and 'start_time' not in event:
-                            event['start_time'] = event.pop('time')
-                        if 'end_time' not in event:
-                            event['end_time'] = None
-                    self.data = imported_data
-                    save_data(self.data)
-                    self.refresh_views()
-                    QMessageBox.information(self, "Import Successful", f"Data imported from {file_path}")
-                else:
-                    QMessageBox.warning(self, "Import Failed", "Invalid data format.")
+                migrate_events(imported_data['events'])
+                self.data = index_data(imported_data)
+                self.data_version += 1
+                QThreadPool.globalInstance().waitForDone()  # So an older background write cannot land last
+                save_data(self.data)
+                self.refresh_views()
+                self.show_message(QMessageBox.Information, "Import Successful", f"Data imported from {file_path}")
             except Exception as e:
-                QMessageBox.warning(self, "Import Failed", f"An error occurred: {str(e)}")
+                self.show_message(QMessageBox.Warning, "Import Failed", f"An error occurred: {str(e)}")
 
 
 # ---------------------------
@@ -906,8 +1409,7 @@ def main():
     app = QApplication(sys.argv)
     
     # Set application-wide font to Palatino
-    font = QFont("Charter", 14)
-    app.setFont(font)
+    app.setFont(app_font())
     
     window = ClarityCalendar()
     window.show()
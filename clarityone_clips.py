@@ -14,14 +14,24 @@
 import sys
 import os
 import re
+import hashlib
+import json
 from datetime import datetime
+from collections import Counter
 import logging
 import threading
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtCore import Qt, QSize, QTimer
+from PyQt5.QtCore import (
+    Qt, QSize, QTimer, QAbstractTableModel, QSortFilterProxyModel, QModelIndex,
+    QObject, QRunnable, QThreadPool, pyqtSignal
+)
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QTableWidget, QTableWidgetItem,
+    QApplication, QMainWindow, QTableView,
     QPushButton, QVBoxLayout, QWidget, QMessageBox, QInputDialog,
     QLineEdit, QLabel, QHBoxLayout, QSystemTrayIcon, QMenu, QAction,
     QFileDialog
@@ -43,6 +53,11 @@ def get_history_file_path():
 
 HISTORY_FILE = get_history_file_path()
 
+# Edits to existing entries are appended here instead of rewriting the history file
+HISTORY_JOURNAL_FILE = HISTORY_FILE + ".journal"
+# Journal size above which its edits are folded back into the history file
+JOURNAL_COMPACT_SIZE = 64 * 1024
+
 def get_log_file_path():
     """Return the path to the log file in Logs."""
     logs_dir = os.path.expanduser("~/Library/Logs/ClarityClips")
@@ -54,14 +69,47 @@ LOG_FILE = get_log_file_path()
 MAX_ENTRIES = 1000
 WARNING_THRESHOLD = 900
 
+# Interval between clipboard polls (milliseconds). Polling only backs up the
+# dataChanged signal, which some platforms do not emit for other applications' copies
+CLIPBOARD_POLL_MS = 1500
+
+# Delay after the last keystroke in the search bar before the table is filtered (milliseconds)
+SEARCH_DEBOUNCE_MS = 150
+
+# Number of rows measured when sizing the table columns to their contents
+RESIZE_PRECISION_ROWS = 100
+
 FILE_PATH_REGEX = re.compile(
     r'^(/[^/\0]*)+/\S+\.(pdf|docx|xlsx)$',
     re.IGNORECASE
 )
+# Extensions FILE_PATH_REGEX accepts, checked first as plain string suffixes
+SUPPORTED_FILE_EXTENSIONS = ('.pdf', '.docx', '.xlsx')
+
+# Searched for instead of lowercasing the whole content, which copies it
+HTML_TAG_REGEX = re.compile(r'<html>', re.IGNORECASE)
+
+# PDFs with more pages than this have their pages extracted in parallel processes
+PDF_PARALLEL_PAGES = 50
+# Number of pages each process extracts per task
+PDF_PAGES_PER_TASK = 16
 
 # Initialize a lock for file operations
 file_lock = threading.Lock()
 
+# Handle new entries are appended through, kept open between appends
+history_append_file = None
+
+# Queue of history writes, as (function, args), applied in order by a single writer thread started on first use
+history_write_queue = queue.Queue()
+history_writer_thread = None
+# Set when a queued write fails, until the GUI reloads the history from the file
+history_write_failed = threading.Event()
+
+# Process pool for extracting large PDFs, started on first use
+pdf_process_pool = None
+pdf_pool_lock = threading.Lock()
+
 # ------------------------ Logging Setup ------------------------ #
 
 logging.basicConfig(
@@ -81,17 +129,42 @@ def extract_text_from_html(html_content):
         logging.error(f"Error extracting text from HTML: {e}")
         return None
 
+def get_pdf_process_pool():
+    """Return the process pool used for large PDFs, starting it on first use."""
+    global pdf_process_pool
+    with pdf_pool_lock:
+        if pdf_process_pool is None:
+            # Spawned rather than forked, as forking a process with Qt threads running is unsafe
+            pdf_process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return pdf_process_pool
+
+def pdf_pages_text(reader, pdf_path, start, stop):
+    """Return the plain text of pages start to stop of an open PDF, joined once at the end."""
+    texts = []
+    for page_num in range(start, stop):
+        page_text = reader.pages[page_num].extract_text()
+        if page_text:
+            texts.append(page_text)
+        else:
+            logging.warning(f"No text found on page {page_num + 1} of {pdf_path}.")
+    return "".join(texts)
+
+def extract_pdf_page_range(pdf_path, start, stop):
+    """Extract the plain text of pages start to stop of a PDF file. Runs in a worker process."""
+    return pdf_pages_text(PyPDF2.PdfReader(pdf_path), pdf_path, start, stop)
+
 def extract_text_from_pdf(pdf_path):
     """Extract plain text from a PDF file."""
     try:
         reader = PyPDF2.PdfReader(pdf_path)
-        text = ""
-        for page_num, page in enumerate(reader.pages, start=1):
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text
-            else:
-                logging.warning(f"No text found on page {page_num} of {pdf_path}.")
+        page_count = len(reader.pages)
+        if page_count > PDF_PARALLEL_PAGES:
+            # Spread the pages over all cores; each process opens the file for itself
+            starts = range(0, page_count, PDF_PAGES_PER_TASK)
+            stops = [min(start + PDF_PAGES_PER_TASK, page_count) for start in starts]
+            text = "".join(get_pdf_process_pool().map(extract_pdf_page_range, repeat(pdf_path), starts, stops))
+        else:
+            text = pdf_pages_text(reader, pdf_path, 0, page_count)
         return text if text else None
     except Exception as e:
         logging.error(f"Error reading PDF '{pdf_path}': {e}")
@@ -109,23 +182,168 @@ def extract_text_from_word(doc_path):
 def extract_text_from_excel(excel_path):
     """Extract plain text from an Excel file."""
     try:
-        workbook = openpyxl.load_workbook(excel_path, data_only=True)
-        text = ""
-        for sheet in workbook.worksheets:
-            for row in sheet.iter_rows(values_only=True):
-                row_text = " ".join([str(cell) for cell in row if cell is not None])
-                if row_text:
-                    text += row_text + "\n"
-        return text if text else None
+        # Read-only mode streams the rows instead of building every cell object up front
+        workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            row_texts = []
+            for sheet in workbook.worksheets:
+                for row in sheet.iter_rows(values_only=True):
+                    row_text = " ".join([str(cell) for cell in row if cell is not None])
+                    if row_text:
+                        row_texts.append(row_text + "\n")
+        finally:
+            workbook.close()  # Read-only workbooks keep the file open until closed
+        return "".join(row_texts) if row_texts else None
     except Exception as e:
         logging.error(f"Error reading Excel file '{excel_path}': {e}")
         return None
 
+def extract_text_from_file(file_path):
+    """Extract plain text from a PDF, Word or Excel file, based on its extension."""
+    file_extension = os.path.splitext(file_path)[1].lower()
+    if file_extension == '.pdf':
+        return extract_text_from_pdf(file_path)
+    elif file_extension == '.docx':
+        return extract_text_from_word(file_path)
+    elif file_extension == '.xlsx':
+        return extract_text_from_excel(file_path)
+    return None
+
+def is_file_path(text):
+    """Check if text is the path of a supported file, trying cheap string checks before FILE_PATH_REGEX."""
+    # The regex also matches before one trailing newline; it backtracks heavily on long text starting with '/'
+    if not text.startswith('/') or not text[-6:].rstrip('\n').lower().endswith(SUPPORTED_FILE_EXTENSIONS):
+        return False
+    return FILE_PATH_REGEX.match(text) is not None
+
+def content_fingerprint(content):
+    """Return a short fingerprint of clipboard content, used to detect duplicates."""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest()
+
+def split_history_line(line):
+    """Return the (timestamp, content, 'Tags: ...') parts of a history line, or None if it has fewer."""
+    parts = line.strip().split(' | ', 2)  # Limit splits to 2
+    return tuple(parts) if len(parts) == 3 else None
+
+def history_row(line, parts):
+    """Return the table row (timestamp, content preview, tags) for a history line and its parts, or None if it is malformed."""
+    if parts is None:
+        logging.warning(f"Malformed line skipped: {line.strip()}")
+        return None
+    timestamp, content, tags = parts
+    # Validate timestamp format
+    try:
+        datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        logging.warning(f"Invalid timestamp format skipped: {line.strip()}")
+        return None
+    content_preview = (content[:100] + '...') if len(content) > 100 else content
+    tags = tags.replace('Tags: ', '')
+    return (timestamp, content_preview, tags)
+
 def sanitize_content(content):
     """Sanitize content by removing newline and carriage return characters."""
     # Replace ' | ' in content to prevent split issues
     return content.replace('\n', ' ').replace('\r', '').replace(' | ', ' || ')
 
+def read_history_lines():
+    """Read the history lines oldest first, with the journaled edits applied. Call with file_lock held."""
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    if os.path.exists(HISTORY_JOURNAL_FILE):
+        with open(HISTORY_JOURNAL_FILE, 'r', encoding='utf-8') as f:
+            for record_line in f:
+                try:
+                    apply_journal_record(lines, json.loads(record_line))
+                except (ValueError, KeyError, IndexError):
+                    # A record torn by a crash; later records could not be trusted either
+                    logging.warning(f"Unreadable journal record skipped: {record_line.strip()[:50]}")
+                    write_history_lines(lines)
+                    break
+    return lines
+
+def apply_journal_record(lines, record):
+    """Apply one journaled edit to the history lines, which are oldest first."""
+    if record['op'] == 'tags':
+        for index, tags in record['tags']:
+            timestamp, content, _ = lines[index].strip().split(' | ', 2)
+            lines[index] = f"{timestamp} | {content} | Tags: {tags}\n"
+    elif record['op'] == 'delete':
+        for index in sorted(record['indexes'], reverse=True):
+            del lines[index]
+    else:
+        raise KeyError(record['op'])
+
+def journal_edit(record):
+    """Append an edit to the journal, folding the journal into the history file once it grows large. Call with file_lock held."""
+    with open(HISTORY_JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+        journal_size = f.tell()
+    if journal_size > JOURNAL_COMPACT_SIZE:
+        write_history_lines(read_history_lines())
+        logging.info("History journal compacted.")
+
+def append_history_line(line):
+    """Append a line to the history file through the open append handle. Call with file_lock held."""
+    global history_append_file
+    if history_append_file is None:
+        history_append_file = open(HISTORY_FILE, 'a', encoding='utf-8')
+    history_append_file.write(line)
+    history_append_file.flush()  # Written out straight away, as the app may be quit at any time
+
+def close_history_append_file():
+    """Close the append handle, to be reopened by the next append. Call with file_lock held."""
+    global history_append_file
+    if history_append_file is not None:
+        history_append_file.close()
+        history_append_file = None
+
+def write_history_lines(lines):
+    """Rewrite the history file from lines, oldest first, and drop the journal. Call with file_lock held."""
+    close_history_append_file()
+    # Written to a temporary file that replaces the history in one step, so a crash cannot truncate it
+    temp_file = HISTORY_FILE + ".tmp"
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write("".join(lines))  # One write call for the whole file
+        os.replace(temp_file, HISTORY_FILE)
+    except OSError:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    if os.path.exists(HISTORY_JOURNAL_FILE):
+        os.remove(HISTORY_JOURNAL_FILE)
+
+def history_writer_loop():
+    """Apply the queued history writes one at a time, in the order they were queued."""
+    while True:
+        function, args = history_write_queue.get()
+        try:
+            if history_write_failed.is_set() and function is journal_edit:
+                # Its line indexes count the entry whose write failed
+                logging.warning("Skipped a history journal edit after a failed write.")
+            else:
+                with file_lock:
+                    function(*args)
+        except Exception as e:
+            logging.error(f"Error writing to history file: {e}")
+            history_write_failed.set()
+            history_writer_signals.write_failed.emit()
+        finally:
+            history_write_queue.task_done()
+
+def queue_history_write(function, *args):
+    """Queue a call to a history write function for the writer thread, which holds file_lock for it."""
+    global history_writer_thread
+    if history_writer_thread is None:
+        history_writer_thread = threading.Thread(target=history_writer_loop, name="HistoryWriter", daemon=True)
+        history_writer_thread.start()
+    history_write_queue.put((function, args))
+
+def flush_history_writes():
+    """Wait until every queued history write has been applied. Call without file_lock held."""
+    history_write_queue.join()
+
 def export_history_to_file(export_path, entries=None):
     """
     Export the clipboard history to the specified file path.
@@ -133,11 +351,11 @@ def export_history_to_file(export_path, entries=None):
     Otherwise, export the provided list of entries.
     """
     try:
+        flush_history_writes()
         with file_lock:
             with open(export_path, 'w', encoding='utf-8') as dest:
                 if entries is None:
-                    with open(HISTORY_FILE, 'r', encoding='utf-8') as src:
-                        dest.writelines(src.readlines())
+                    dest.writelines(read_history_lines())
                 else:
                     for entry in entries:
                         dest.write(entry)
@@ -147,6 +365,124 @@ def export_history_to_file(export_path, entries=None):
         logging.error(f"Error exporting history: {e}")
         return False, str(e)
 
+# ------------------------ Background Workers ------------------------ #
+
+class ExtractTextSignals(QObject):
+    """Signals emitted by ExtractTextWorker."""
+    extracted = pyqtSignal(str, str)  # File path, extracted text ('' if none)
+
+class ExtractTextWorker(QRunnable):
+    """Extract the text of a copied document on the thread pool, so large files do not block the UI."""
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = ExtractTextSignals()
+
+    def run(self):
+        """Extract the text and hand it back to the GUI thread."""
+        text = extract_text_from_file(self.file_path)
+        self.signals.extracted.emit(self.file_path, text or '')
+
+class HistoryWriterSignals(QObject):
+    """Signals emitted by the history writer thread."""
+    write_failed = pyqtSignal()
+
+# Tells the GUI that a queued history write failed
+history_writer_signals = HistoryWriterSignals()
+
+# ------------------------ Table Models ------------------------ #
+
+class HistoryTableModel(QAbstractTableModel):
+    """Table model over the clipboard history rows, showing the newest entry first."""
+
+    HEADERS = ['Timestamp', 'Content Preview', 'Tags']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # One row per entry of the window, oldest first like the history file:
+        # (timestamp, content preview, tags), or None for a malformed line
+        self.rows = []
+        self.search_texts = []  # Lowercased text of each row, filled in the first time it is searched
+
+    def entry_index(self, row):
+        """Return the index in the window's entries of a table row."""
+        return len(self.rows) - 1 - row
+
+    def row_data(self, row):
+        """Return the (timestamp, content preview, tags) of a table row, or None for a malformed line."""
+        return self.rows[self.entry_index(row)]
+
+    def search_text(self, row):
+        """Return the lowercased text of a table row, separated so a query never spans columns."""
+        position = self.entry_index(row)
+        text = self.search_texts[position]
+        if text is None:
+            text = self.search_texts[position] = "\0".join(self.rows[position]).lower()
+        return text
+
+    def set_rows(self, rows):
+        """Replace all rows at once, given oldest first."""
+        self.beginResetModel()
+        self.rows = rows
+        self.search_texts = [None] * len(rows)
+        self.endResetModel()
+
+    def append_row(self, row):
+        """Add the row of a new entry, shown at the top."""
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.rows.append(row)
+        self.search_texts.append(None)
+        self.endInsertRows()
+
+    def remove_oldest_rows(self, count):
+        """Remove the rows of the count oldest entries, shown at the bottom."""
+        self.beginRemoveRows(QModelIndex(), len(self.rows) - count, len(self.rows) - 1)
+        del self.rows[:count]
+        del self.search_texts[:count]
+        self.endRemoveRows()
+
+    def set_row(self, position, row):
+        """Replace the row of the entry at position, counted oldest first."""
+        self.rows[position] = row
+        self.search_texts[position] = None
+        table_row = self.entry_index(position)  # The mapping is its own inverse
+        self.dataChanged.emit(self.index(table_row, 0), self.index(table_row, len(self.HEADERS) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.row_data(index.row())[index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+class HistoryFilterModel(QSortFilterProxyModel):
+    """Filters the history rows by a search query, using their precomputed search text."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+
+    def set_query(self, query):
+        """Show only the rows containing query, ignoring case."""
+        self.query = query.lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        if model.row_data(source_row) is None:
+            return False  # Malformed lines are never shown
+        return not self.query or self.query in model.search_text(source_row)
+
 # ------------------------ GUI Application ------------------------ #
 
 class ClipboardManagerGUI(QMainWindow):
@@ -168,16 +504,25 @@ class ClipboardManagerGUI(QMainWindow):
         self.search_label = QLabel("Search:")
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Enter keyword or tag...")
-        self.search_bar.textChanged.connect(self.filter_table)
+        # Filter once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_table)
+        self.search_bar.textChanged.connect(self.search_timer.start)
         self.search_layout.addWidget(self.search_label)
         self.search_layout.addWidget(self.search_bar)
         self.layout.addLayout(self.search_layout)
 
         # Table for clipboard history
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(['Timestamp', 'Content Preview', 'Tags'])
+        self.history_model = HistoryTableModel(self)
+        self.filter_model = HistoryFilterModel(self)
+        self.filter_model.setSourceModel(self.history_model)
+        self.table = QTableView()
+        self.table.setModel(self.filter_model)
         self.table.horizontalHeader().setStretchLastSection(True)
+        # Size columns from the first rows only, so the model is not asked for every row's text
+        self.table.horizontalHeader().setResizeContentsPrecision(RESIZE_PRECISION_ROWS)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.table.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)  # Enable multiple selection
@@ -277,8 +622,13 @@ class ClipboardManagerGUI(QMainWindow):
         # Set Application Name to "Clarity Clips"
         QApplication.setApplicationName("Clarity Clips")
 
-        # Initialize the entries list
+        # Initialize the entries list, and the split parts of each entry
         self.entries = []
+        self.entry_parts = []
+
+        # Fingerprints of the contents in the history, for duplicate checks without reading the file,
+        # counted so a content stays known while any entry still holds it
+        self.content_fingerprints = Counter()
 
         # Load initial history
         self.load_history()
@@ -286,6 +636,14 @@ class ClipboardManagerGUI(QMainWindow):
         # Initialize QClipboard
         self.clipboard = QApplication.clipboard()
         self.clipboard.dataChanged.connect(self.on_clipboard_change)
+        history_writer_signals.write_failed.connect(self.on_history_write_failed)
+
+        # Text extraction running on the thread pool, by file path
+        self.extract_workers = {}
+
+        # Raw clipboard data last seen, and the content it was processed into
+        self.last_clipboard_key = None
+        self.last_clipboard_result = ""
 
         # Flag to ignore clipboard changes initiated by the app
         self.ignore_clipboard_change = False
@@ -295,7 +653,7 @@ class ClipboardManagerGUI(QMainWindow):
 
         # Initialize QTimer for clipboard polling
         self.clipboard_timer = QTimer()
-        self.clipboard_timer.setInterval(500)  # Check every 500 ms
+        self.clipboard_timer.setInterval(CLIPBOARD_POLL_MS)
         self.clipboard_timer.timeout.connect(self.poll_clipboard)
         self.clipboard_timer.start()
 
@@ -311,15 +669,23 @@ class ClipboardManagerGUI(QMainWindow):
         """Retrieve and sanitize the current clipboard content."""
         mime = self.clipboard.mimeData()
         if mime.hasText():
-            return sanitize_content(mime.text().strip())
-        elif mime.hasUrls():
-            urls = mime.urls()
-            if urls:
-                file_path = urls[0].toLocalFile()
-                if FILE_PATH_REGEX.match(file_path):
-                    processed_content = self.process_content(file_path)
-                    return sanitize_content(processed_content) if processed_content else sanitize_content(file_path)
-        return ""
+            clipboard_key = ('text', mime.text())
+        elif mime.hasUrls() and mime.urls():
+            clipboard_key = ('file', mime.urls()[0].toLocalFile())
+        else:
+            return ""
+        # Most polls find the clipboard unchanged; reuse the result instead of processing it again
+        if clipboard_key == self.last_clipboard_key:
+            return self.last_clipboard_result
+
+        kind, raw = clipboard_key
+        content = ""
+        if kind == 'text':
+            content = sanitize_content(raw.strip())
+        elif is_file_path(raw):
+            content = sanitize_content(raw)  # The file's text is extracted in handle_clipboard_change
+        self.last_clipboard_key, self.last_clipboard_result = clipboard_key, content
+        return content
 
     def poll_clipboard(self):
         """Periodically check the clipboard for changes."""
@@ -337,8 +703,12 @@ class ClipboardManagerGUI(QMainWindow):
             logging.info("Ignored clipboard change triggered by the application.")
             return
 
+        # The signal saw this change, so the next poll is only needed a full interval from now
+        if self.clipboard_timer.isActive():
+            self.clipboard_timer.start()
         current_content = self.get_current_clipboard_content()
         if current_content:
+            self.last_clipboard_content = current_content  # Keep the poll from handling it again
             logging.info(f"Clipboard changed detected via signal: {current_content[:50]}...")
             self.handle_clipboard_change(current_content)
 
@@ -349,55 +719,53 @@ class ClipboardManagerGUI(QMainWindow):
             logging.info("Duplicate clipboard entry detected. Skipping.")
             return
 
-        processed_content = self.process_content(content)
+        # Detect if content is a Unix-like file path; its text is extracted on the thread pool
+        if is_file_path(content):
+            if content not in self.extract_workers:
+                worker = ExtractTextWorker(content)
+                worker.signals.extracted.connect(self.file_text_extracted)
+                self.extract_workers[content] = worker
+                QThreadPool.globalInstance().start(worker)
+            return
+
+        self.add_entry(self.process_content(content))
+
+    def file_text_extracted(self, file_path, text):
+        """Record the text extracted by ExtractTextWorker, or the file path if there was none."""
+        del self.extract_workers[file_path]
+        content = sanitize_content(text) if text else file_path
+        if self.is_duplicate(content):
+            logging.info("Duplicate clipboard entry detected. Skipping.")
+            return
+        self.add_entry(content)
+
+    def add_entry(self, processed_content):
+        """Append processed clipboard content to the history."""
         if processed_content:
             sanitized_content = sanitize_content(processed_content)
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             entry = f"{current_time} | {sanitized_content} | Tags: \n"
+            parts = split_history_line(entry)
             try:
-                with file_lock:
-                    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
-                        f.write(entry)
+                # The writer thread does the disk I/O, so the GUI thread never waits on it
+                queue_history_write(append_history_line, entry)
+                self.content_fingerprints[content_fingerprint(sanitized_content)] += 1
                 logging.info(f"New clipboard entry added at {current_time}.")
-                self.load_history()
+                # Only the new row is added to the table, instead of reloading the whole history
+                self.entries.append(entry)
+                self.entry_parts.append(parts)
+                self.history_model.append_row(history_row(entry, parts))
                 self.check_entry_limit()
             except Exception as e:
                 logging.error(f"Error writing to history file: {e}")
 
     def is_duplicate(self, content):
         """Check if the clipboard content is a duplicate."""
-        try:
-            with file_lock:
-                if not os.path.exists(HISTORY_FILE):
-                    return False
-                with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        parts = line.strip().split(' | ', 2)
-                        if len(parts) < 3:
-                            continue
-                        _, existing_content, _ = parts
-                        if existing_content == content:
-                            return True
-            return False
-        except Exception as e:
-            logging.error(f"Error checking for duplicates: {e}")
-            return False
+        return content_fingerprint(content) in self.content_fingerprints
 
     def process_content(self, content):
         """Process clipboard content to extract plain text."""
-        # Detect if content is a Unix-like file path
-        if FILE_PATH_REGEX.match(content):
-            file_path = content
-            file_extension = os.path.splitext(file_path)[1].lower()
-            if file_extension == '.pdf':
-                return extract_text_from_pdf(file_path) or content
-            elif file_extension == '.docx':
-                return extract_text_from_word(file_path) or content
-            elif file_extension == '.xlsx':
-                return extract_text_from_excel(file_path) or content
-            else:
-                return content
-        elif "<html>" in content.lower():
+        if HTML_TAG_REGEX.search(content):
             extracted = extract_text_from_html(content)
             return extracted if extracted else content
         else:
@@ -405,72 +773,83 @@ class ClipboardManagerGUI(QMainWindow):
 
     def load_history(self):
         """Load clipboard history from file into the table."""
-        self.table.setRowCount(0)
+        self.history_model.set_rows([])
         self.entries = []
+        self.entry_parts = []
+        self.content_fingerprints = Counter()
 
+        flush_history_writes()  # The file must hold every entry queued so far
+        history_write_failed.clear()  # The entries are rebuilt from the file below
         if not os.path.exists(HISTORY_FILE):
-            open(HISTORY_FILE, 'w', encoding='utf-8').close()
+            with file_lock:
+                write_history_lines([])
             return
 
         try:
             with file_lock:
-                with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-            self.entries = lines[::-1]  # Reverse to show latest first
+                lines = read_history_lines()
+            self.entries = lines  # Oldest first, like the file; the table shows the latest first
+            self.entry_parts = [split_history_line(line) for line in lines]
         except Exception as e:
             logging.error(f"Error reading history file: {e}")
             QMessageBox.critical(self, "Error", "Failed to read history file.")
             return
 
-        for line in self.entries:
-            parts = line.strip().split(' | ', 2)  # Limit splits to 2
-            if len(parts) < 3:
-                logging.warning(f"Malformed line skipped: {line.strip()}")
-                continue
-            timestamp, content, tags = parts
-            # Validate timestamp format
-            try:
-                datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                logging.warning(f"Invalid timestamp format skipped: {line.strip()}")
-                continue
-            content_preview = (content[:100] + '...') if len(content) > 100 else content
-            tags = tags.replace('Tags: ', '')
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            self.table.setItem(row_position, 0, QTableWidgetItem(timestamp))
-            self.table.setItem(row_position, 1, QTableWidgetItem(content_preview))
-            self.table.setItem(row_position, 2, QTableWidgetItem(tags))
+        for parts in self.entry_parts:
+            if parts is not None:
+                self.content_fingerprints[content_fingerprint(parts[1])] += 1
 
+        self.table.setUpdatesEnabled(False)
+        self.history_model.set_rows([history_row(line, parts) for line, parts in zip(self.entries, self.entry_parts)])
         self.table.resizeColumnsToContents()
         self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setUpdatesEnabled(True)
+
+    def on_history_write_failed(self):
+        """Reload the history after a queued write failed, so self.entries matches the file again."""
+        if history_write_failed.is_set():  # Not reloaded since
+            self.load_history()
+
+    def history_writes_failed(self):
+        """Apply the queued history writes, reloading the history and reporting it if one of them failed."""
+        flush_history_writes()
+        if not history_write_failed.is_set():
+            return False
+        # The edit's line indexes count the entry that was not saved
+        self.load_history()
+        QMessageBox.critical(self, "Error", "A clipboard entry could not be saved, so the history was reloaded. Please try again.")
+        return True
+
+    def set_entry(self, row, entry):
+        """Replace the entry at an index of self.entries, updating its table row in place."""
+        parts = split_history_line(entry)
+        self.entries[row] = entry
+        self.entry_parts[row] = parts
+        self.history_model.set_row(row, history_row(entry, parts))
 
     def filter_table(self):
         """Filter the table based on the search query."""
-        query = self.search_bar.text().lower()
-        for row in range(self.table.rowCount()):
-            match = False
-            for column in range(self.table.columnCount()):
-                item = self.table.item(row, column)
-                if item and query in item.text().lower():
-                    match = True
-                    break
-            self.table.setRowHidden(row, not match)
+        self.filter_model.set_query(self.search_bar.text())
+
+    def selected_rows(self):
+        """Return the selected rows as indexes into self.entries."""
+        return [
+            self.history_model.entry_index(self.filter_model.mapToSource(index).row())
+            for index in self.table.selectionModel().selectedRows()
+        ]
 
     def copy_selected(self):
         """Copy the full content of the selected clipboard entries back to the clipboard."""
-        selected_rows = self.table.selectionModel().selectedRows()
+        selected_rows = self.selected_rows()
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select at least one entry to copy.")
             return
 
         copied_contents = []
         try:
-            for selected in selected_rows:
-                row = selected.row()
-                entry_line = self.entries[row]
-                parts = entry_line.strip().split(' | ', 2)
-                if len(parts) < 3:
+            for row in selected_rows:
+                parts = self.entry_parts[row]
+                if parts is None:
                     continue
                 _, content, _ = parts
                 copied_contents.append(content)
@@ -490,7 +869,7 @@ class ClipboardManagerGUI(QMainWindow):
 
     def add_tag(self):
         """Add a tag to the selected clipboard entries."""
-        selected_rows = self.table.selectionModel().selectedRows()
+        selected_rows = self.selected_rows()
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select at least one entry to add a tag.")
             return
@@ -501,13 +880,13 @@ class ClipboardManagerGUI(QMainWindow):
 
         new_tags = ','.join([t.strip() for t in tag.split(',')])
         updated_count = 0
+        tag_changes = []  # [index in the history file, new tags]
+        updated_entries = []  # (index in self.entries, updated entry line)
 
         try:
-            for selected in selected_rows:
-                row = selected.row()
-                entry_line = self.entries[row]
-                parts = entry_line.strip().split(' | ', 2)
-                if len(parts) < 3:
+            for row in selected_rows:
+                parts = self.entry_parts[row]
+                if parts is None:
                     continue
                 timestamp, content, tags_part = parts
                 tags = tags_part.replace('Tags: ', '').strip()
@@ -521,27 +900,31 @@ class ClipboardManagerGUI(QMainWindow):
 
                     # Reconstruct the entry line
                     updated_entry = f"{timestamp} | {content} | Tags: {updated_tags}\n"
-                    self.entries[row] = updated_entry
+                    updated_entries.append((row, updated_entry))
+                    tag_changes.append([row, updated_tags])
                     updated_count += 1
 
             if updated_count > 0:
-                # Write back to the history file
+                # Record the change in the history journal, then apply it to the entries
+                if self.history_writes_failed():
+                    return
                 with file_lock:
-                    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-                        f.writelines(self.entries[::-1])  # Reverse back to original order
+                    journal_edit({"op": "tags", "tags": tag_changes})
+                for row, updated_entry in updated_entries:
+                    self.set_entry(row, updated_entry)
 
                 logging.info(f"Added tags to {updated_count} entr{'y' if updated_count==1 else 'ies'}.")
-                self.load_history()
                 QMessageBox.information(self, "Success", f"Tags added to {updated_count} entr{'y' if updated_count==1 else 'ies'} successfully.")
             else:
                 QMessageBox.information(self, "No Update", "No new tags were added (all tags already exist).")
         except Exception as e:
             logging.error(f"Error adding tags: {e}")
+            self.load_history()  # The journal may hold part of the change
             QMessageBox.critical(self, "Error", "Failed to add tags to selected entries.")
 
     def modify_tags(self):
         """Modify the tags of the selected clipboard entries."""
-        selected_rows = self.table.selectionModel().selectedRows()
+        selected_rows = self.selected_rows()
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select at least one entry to modify tags.")
             return
@@ -553,39 +936,43 @@ class ClipboardManagerGUI(QMainWindow):
 
         new_tags = ','.join([t.strip() for t in tag.split(',')])
         updated_count = 0
+        tag_changes = []  # [index in the history file, new tags]
+        updated_entries = []  # (index in self.entries, updated entry line)
 
         try:
-            for selected in selected_rows:
-                row = selected.row()
-                entry_line = self.entries[row]
-                parts = entry_line.strip().split(' | ', 2)
-                if len(parts) < 3:
+            for row in selected_rows:
+                parts = self.entry_parts[row]
+                if parts is None:
                     continue
                 timestamp, content, tags_part = parts
 
                 # Replace the existing tags with new tags
                 updated_entry = f"{timestamp} | {content} | Tags: {new_tags}\n"
-                self.entries[row] = updated_entry
+                updated_entries.append((row, updated_entry))
+                tag_changes.append([row, new_tags])
                 updated_count += 1
 
             if updated_count > 0:
-                # Write back to the history file
+                # Record the change in the history journal, then apply it to the entries
+                if self.history_writes_failed():
+                    return
                 with file_lock:
-                    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-                        f.writelines(self.entries[::-1])  # Reverse back to original order
+                    journal_edit({"op": "tags", "tags": tag_changes})
+                for row, updated_entry in updated_entries:
+                    self.set_entry(row, updated_entry)
 
                 logging.info(f"Modified tags for {updated_count} entr{'y' if updated_count==1 else 'ies'}.")
-                self.load_history()
                 QMessageBox.information(self, "Success", f"Tags modified for {updated_count} entr{'y' if updated_count==1 else 'ies'} successfully.")
             else:
                 QMessageBox.warning(self, "No Update", "No tags were modified.")
         except Exception as e:
             logging.error(f"Error modifying tags: {e}")
+            self.load_history()  # The journal may hold part of the change
             QMessageBox.critical(self, "Error", "Failed to modify tags for selected entries.")
 
     def delete_selected(self):
         """Delete the selected clipboard entries."""
-        selected_rows = self.table.selectionModel().selectedRows()
+        selected_rows = self.selected_rows()
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select at least one entry to delete.")
             return
@@ -600,33 +987,35 @@ class ClipboardManagerGUI(QMainWindow):
         if reply == QMessageBox.Yes:
             try:
                 # Collect unique row indices to delete
-                rows_to_delete = sorted([selected.row() for selected in selected_rows], reverse=True)
-                for row in rows_to_delete:
-                    del self.entries[row]
+                rows_to_delete = sorted(selected_rows, reverse=True)
 
-                # Write back to the history file
+                # Record the deletion in the history journal, then apply it to the entries
+                if self.history_writes_failed():
+                    return
                 with file_lock:
-                    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-                        f.writelines(self.entries[::-1])  # Reverse back to original order
+                    journal_edit({"op": "delete", "indexes": rows_to_delete})
+                for row in rows_to_delete:
+                    del self.entries[row]
+                    del self.entry_parts[row]
 
                 logging.info(f"Deleted {len(rows_to_delete)} entr{'y' if len(rows_to_delete)==1 else 'ies'}.")
                 self.load_history()
                 QMessageBox.information(self, "Success", f"Deleted {len(rows_to_delete)} entr{'y' if len(rows_to_delete)==1 else 'ies'} successfully.")
             except Exception as e:
                 logging.error(f"Error deleting entries: {e}")
+                self.load_history()  # The journal may hold part of the change
                 QMessageBox.critical(self, "Error", "Failed to delete the selected entries.")
 
     def export_selected(self):
         """Export the selected clipboard entries to a text file."""
-        selected_rows = self.table.selectionModel().selectedRows()
+        selected_rows = self.selected_rows()
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select at least one entry to export.")
             return
 
         entries_to_export = []
         try:
-            for selected in selected_rows:
-                row = selected.row()
+            for row in selected_rows:
                 entry_line = self.entries[row]
                 entries_to_export.append(entry_line)
 
@@ -691,11 +1080,19 @@ class ClipboardManagerGUI(QMainWindow):
                 # Trigger warning in the GUI
                 self.show_warning()
             elif entry_count > MAX_ENTRIES:
-                # Remove the oldest entries to maintain the limit
-                self.entries = self.entries[-MAX_ENTRIES:]
-                with file_lock:
-                    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-                        f.writelines(self.entries[::-1])  # Reverse back to original order
+                # Remove the oldest entries to maintain the limit; they come first in the history file
+                excess = entry_count - MAX_ENTRIES
+                # Their contents are no longer duplicates unless a kept entry holds them too
+                for parts in self.entry_parts[:excess]:
+                    if parts is not None:
+                        fingerprint = content_fingerprint(parts[1])
+                        self.content_fingerprints[fingerprint] -= 1
+                        if self.content_fingerprints[fingerprint] <= 0:
+                            del self.content_fingerprints[fingerprint]
+                del self.entries[:excess]
+                del self.entry_parts[:excess]
+                self.history_model.remove_oldest_rows(excess)
+                queue_history_write(journal_edit, {"op": "delete", "indexes": list(range(excess))})
                 logging.info(f"Clipboard entries trimmed to the last {MAX_ENTRIES} entries.")
         except Exception as e:
             logging.error(f"Error checking entry limit: {e}")
@@ -715,6 +1112,9 @@ class ClipboardManagerGUI(QMainWindow):
             QMessageBox.No
         )
         if confirm == QMessageBox.Yes:
+            flush_history_writes()
+            with file_lock:
+                close_history_append_file()
             self.tray_icon.hide()
             QApplication.instance().quit()
 
@@ -744,9 +1144,10 @@ class ClipboardManagerGUI(QMainWindow):
         if reply == QMessageBox.Yes:
             try:
                 self.entries = []
+                self.entry_parts = []
+                flush_history_writes()
                 with file_lock:
-                    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-                        f.truncate(0)
+                    write_history_lines([])
                 self.load_history()
                 QMessageBox.information(self, "Success", "Clipboard history cleared successfully.")
                 logging.info("Clipboard history cleared by user.")
@@ -757,6 +1158,7 @@ class ClipboardManagerGUI(QMainWindow):
 # ------------------------ Main Function ------------------------ #
 
 def main():
+    multiprocessing.freeze_support()  # Lets the PDF process pool start from the bundled app
     app = QApplication(sys.argv)
     app.setApplicationName("Clarity Clips")
     global_font = QtGui.QFont("Palatino", 14)
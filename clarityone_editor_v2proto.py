@@ -13,29 +13,305 @@
 
 import sys
 import os
+import mmap
+import re
+import hashlib
+import tempfile
+from functools import lru_cache
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTextEdit, QDialog,
     QComboBox, QFileDialog, QSpinBox, QInputDialog, QMessageBox, QLabel,
     QAction, QToolBar, QLineEdit, QCheckBox, QPushButton, QHBoxLayout, QVBoxLayout,
-    QSplitter, QWidget
+    QSplitter, QWidget, QProgressBar
 )
 from PyQt5.QtGui import (
     QFont, QTextCursor, QTextTableFormat, QKeySequence, QTextBlockFormat,
     QTextListFormat, QTextDocumentWriter, QPalette, QColor, QTextDocument, QTextCharFormat
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtPrintSupport import QPrinter
+from PyQt5.QtCore import (
+    Qt, QObject, QThread, QRunnable, QThreadPool, QSignalBlocker, QTimer, pyqtSignal
+)
+
+# Default line and paragraph spacing, built once and merged into whole documents
+DEFAULT_SPACING_FORMAT = QTextBlockFormat()
+DEFAULT_SPACING_FORMAT.setLineHeight(115, QTextBlockFormat.ProportionalHeight)  # 1.15 line spacing
+DEFAULT_SPACING_FORMAT.setTopMargin(6)  # 6 points before paragraph
+DEFAULT_SPACING_FORMAT.setBottomMargin(6)  # 6 points after paragraph
+
+# Default paragraph alignment (justified)
+DEFAULT_ALIGNMENT_FORMAT = QTextBlockFormat()
+DEFAULT_ALIGNMENT_FORMAT.setAlignment(Qt.AlignJustify)
+
+# Markdown extensions and styles used for the preview pane and PDF export
+MARKDOWN_EXTENSIONS = ['extra', 'codehilite', 'toc', 'nl2br']
+MARKDOWN_CSS = '''
+<style>
+/* Code block styling */
+.codehilite {
+    background-color: #f8f8f8;
+    border: 1px solid #ccc;
+    padding: 5px;
+    overflow-x: auto;
+}
+/* Table styling */
+table {
+    border-collapse: collapse;
+    width: 100%;
+}
+th, td {
+    border: 1px solid #ccc;
+    padding: 5px;
+}
+</style>
+'''
+
+# Number of recent Markdown-to-HTML conversions kept in memory (whole documents / chunks)
+MARKDOWN_CACHE_SIZE = 16
+MARKDOWN_CHUNK_CACHE_SIZE = 1024
+
+# Markdown constructs that can tie text together across blank lines (fenced code,
+# reference and footnote definitions, abbreviations, [TOC], raw HTML, definition lists).
+# Documents using them are always converted as a whole.
+MARKDOWN_WHOLE_DOCUMENT_RE = re.compile(
+    r'^(?: {0,3}(?:```|~~~)| {0,3}\[[^\]]+\]:|\*\[|\[TOC\]|[ \t]*<|: )', re.MULTILINE
+)
+MARKDOWN_BLANK_LINES_RE = re.compile(r'\n(?:[ \t]*\n)+')
+MARKDOWN_LIST_ITEM_RE = re.compile(r'(?:[*+-]|\d+[.)])[ \t]')
+# Heading ids added by the toc extension, which only keeps them unique within one conversion
+MARKDOWN_HEADING_ID_RE = re.compile(r'<h[1-6] id="([^"]*)"')
+
+# Rendered previews of opened Markdown files are kept here between sessions,
+# named by a hash of the Markdown, and trimmed to the size limit oldest-first
+MARKDOWN_DISK_CACHE_DIR = os.path.expanduser("~/Library/Caches/ClarityEditor/markdown")
+MARKDOWN_DISK_CACHE_LIMIT = 32 * 1024 * 1024
+
+# Delay before a line or paragraph spacing change is applied (milliseconds)
+SPACING_DEBOUNCE_MS = 120
+
+# Delay after the last keystroke before the Markdown preview is re-rendered (milliseconds)
+PREVIEW_DEBOUNCE_MS = 150
+
+# Files larger than this are memory-mapped instead of read through a buffered stream
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def read_text_file(file_name):
+    """Read a UTF-8 text file, decoding large files straight from a memory map."""
+    with open(file_name, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, 'utf-8')
+        return f.read().decode('utf-8')
+
+
+def split_markdown_chunks(markdown_text):
+    """Split Markdown at blank lines into chunks that convert independently.
+
+    Returns None when the document uses constructs that span chunks and has to be
+    converted as a whole.
+    """
+    if MARKDOWN_WHOLE_DOCUMENT_RE.search(markdown_text):
+        return None
+    chunks = []
+    for chunk in MARKDOWN_BLANK_LINES_RE.split(markdown_text):
+        if not chunk.strip():
+            continue
+        if chunks and continues_markdown_chunk(chunks[-1], chunk):
+            chunks[-1] += '\n\n' + chunk
+        else:
+            chunks.append(chunk)
+    return chunks
+
+
+def continues_markdown_chunk(previous, chunk):
+    """Return True if a chunk belongs to the block started by the previous chunk."""
+    if chunk[:1] in (' ', '\t'):
+        return True  # Indented continuation of a list item, quote or code block
+    if MARKDOWN_LIST_ITEM_RE.match(chunk) and MARKDOWN_LIST_ITEM_RE.match(previous):
+        return True  # Next item of a loose list
+    return chunk.startswith('>') and previous.startswith('>')
+
+
+def write_text_file(file_name, content):
+    """Write text as UTF-8, encoding it once instead of through a buffered text stream."""
+    data = content.encode('utf-8')
+    temp_name = make_temp_file(file_name)
+    try:
+        with open(temp_name, 'wb') as f:
+            f.write(data)  # Larger than the buffer, so this goes straight to the OS
+        # Swap the finished file in, so a failed save never leaves the original half-written
+        os.replace(temp_name, file_name)
+    except OSError:
+        remove_temp_file(temp_name)
+        raise
+
+
+def write_document(document, file_name, format_name):
+    """Write a QTextDocument with QTextDocumentWriter, replacing file_name only once it succeeds."""
+    temp_name = make_temp_file(file_name)
+    writer = QTextDocumentWriter(temp_name, format_name)
+    written = writer.write(document)
+    del writer  # Closes the temporary file before it is moved
+    if not written:
+        remove_temp_file(temp_name)
+        return False
+    try:
+        os.replace(temp_name, file_name)
+    except OSError:
+        remove_temp_file(temp_name)
+        raise
+    return True
+
+
+def make_temp_file(file_name):
+    """Create a uniquely named temporary file beside file_name, with the permissions a new file_name would get."""
+    directory, base_name = os.path.split(os.path.abspath(file_name))
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=base_name + '.', suffix='.tmp', delete=False) as f:
+        temp_name = f.name
+    # NamedTemporaryFile makes the file private to the user; the saved document should not be
+    umask = os.umask(0)
+    os.umask(umask)
+    try:
+        os.chmod(temp_name, 0o666 & ~umask)
+    except OSError:
+        remove_temp_file(temp_name)
+        raise
+    return temp_name
+
+
+def file_stat(file_name):
+    """Return the (modification time, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def remove_temp_file(temp_name):
+    """Delete a leftover temporary file from a failed save, if there is one."""
+    try:
+        os.remove(temp_name)
+    except OSError:
+        pass
+
+
+def markdown_cache_path(markdown_text):
+    """Return the disk cache file for the rendered preview of some Markdown text."""
+    key = hashlib.blake2b(digest_size=16)
+    # The rendering settings are part of the key, so changing them invalidates old entries
+    key.update(repr(MARKDOWN_EXTENSIONS).encode('utf-8'))
+    key.update(MARKDOWN_CSS.encode('utf-8'))
+    key.update(markdown_text.encode('utf-8'))
+    return os.path.join(MARKDOWN_DISK_CACHE_DIR, key.hexdigest() + '.html')
+
+
+def read_cached_markdown_html(markdown_text):
+    """Return the cached preview HTML for some Markdown text, or '' if there is none."""
+    cache_path = markdown_cache_path(markdown_text)
+    try:
+        with open(cache_path, 'rb') as f:
+            html = f.read().decode('utf-8')
+        os.utime(cache_path)  # Mark as recently used for eviction
+    except (OSError, UnicodeDecodeError):
+        return ''
+    return html
+
+
+def write_cached_markdown_html(markdown_text, html):
+    """Store preview HTML in the disk cache; the cache is best-effort, so failures are ignored."""
+    cache_path = markdown_cache_path(markdown_text)
+    temp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(MARKDOWN_DISK_CACHE_DIR, exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(html.encode('utf-8'))
+        os.replace(temp_path, cache_path)  # Readers never see a partly written entry
+        trim_markdown_disk_cache()
+    except OSError:
+        pass
+
+
+def trim_markdown_disk_cache():
+    """Delete the least recently used cache entries until the cache fits its size limit."""
+    entries = []
+    with os.scandir(MARKDOWN_DISK_CACHE_DIR) as scan:
+        for entry in scan:
+            if entry.name.endswith('.html'):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= MARKDOWN_DISK_CACHE_LIMIT:
+            break
+        os.remove(path)
+        total_size -= size
+
+
+def extract_odt_text(file_name):
+    """Extract the plain text of every paragraph in an ODT file."""
+    # Imported here so sessions that never open an ODT file do not load odfpy
+    from odf import text, teletype
+    from odf.opendocument import load
+
+    odt_doc = load(file_name)
+    all_paras = odt_doc.getElementsByType(text.P)
+    return ''.join(teletype.extractText(para) + '\n' for para in all_paras)
+
+
+class FileLoadSignals(QObject):
+    """Signals emitted by FileLoadWorker."""
+    loaded = pyqtSignal(str, str, str)  # File name, content, cached Markdown preview ('' if none)
+    failed = pyqtSignal(str, str)  # File name, error message
+
+
+class FileLoadWorker(QRunnable):
+    """Read and decode a file on the thread pool so opening does not block the UI."""
+
+    def __init__(self, file_name):
+        super().__init__()
+        self.file_name = file_name
+        self.signals = FileLoadSignals()
+
+    def run(self):
+        """Read the file and hand its text back to the GUI thread."""
+        try:
+            if self.file_name.lower().endswith('.odt'):
+                content = extract_odt_text(self.file_name)
+            else:
+                content = read_text_file(self.file_name)
+        except Exception as e:
+            self.signals.failed.emit(self.file_name, str(e))
+            return
+        # Look up a preview rendered in an earlier session while still off the GUI thread
+        cached_html = ''
+        if self.file_name.lower().endswith('.md'):
+            cached_html = read_cached_markdown_html(content)
+        self.signals.loaded.emit(self.file_name, content, cached_html)
 
-import qdarkstyle
 
-from odf import text, teletype
-from odf.opendocument import load
+class PdfExportWorker(QObject):
+    """Print a QTextDocument to a PDF file off the GUI thread."""
+    finished = pyqtSignal(str, str)  # File name, error message ('' on success)
 
-import markdown
-from markdown.extensions import Extension  
-import pygments  
+    def __init__(self, document, file_name):
+        super().__init__()
+        self.document = document
+        self.file_name = file_name
 
-from spellchecker import SpellChecker
+    def run(self):
+        """Lay out and print the document, then report back to the GUI thread."""
+        # Imported here so sessions that never export a PDF do not load QtPrintSupport
+        from PyQt5.QtPrintSupport import QPrinter
+
+        try:
+            printer = QPrinter(QPrinter.HighResolution)
+            printer.setOutputFormat(QPrinter.PdfFormat)
+            printer.setOutputFileName(self.file_name)
+            self.document.print_(printer)
+            self.finished.emit(self.file_name, '')
+        except Exception as e:
+            self.finished.emit(self.file_name, str(e))
 
 
 class FindReplaceDialog(QDialog):
@@ -60,12 +336,14 @@ class FindReplaceDialog(QDialog):
         self.find_next_button = QPushButton('Find Next')
         self.replace_button = QPushButton('Replace')
         self.replace_all_button = QPushButton('Replace All')
+        self.replace_list_button = QPushButton('Replace List...')
         self.close_button = QPushButton('Close')
 
         # Connect signals
         self.find_next_button.clicked.connect(self.find_next)
         self.replace_button.clicked.connect(self.replace)
         self.replace_all_button.clicked.connect(self.replace_all)
+        self.replace_list_button.clicked.connect(self.replace_list)
         self.close_button.clicked.connect(self.close)
         self.find_input.textChanged.connect(self.highlight_all_occurrences)  # Highlight as you type
 
@@ -87,6 +365,7 @@ class FindReplaceDialog(QDialog):
         buttons_layout.addWidget(self.find_next_button)
         buttons_layout.addWidget(self.replace_button)
         buttons_layout.addWidget(self.replace_all_button)
+        buttons_layout.addWidget(self.replace_list_button)
         buttons_layout.addWidget(self.close_button)
 
         main_layout = QVBoxLayout()
@@ -97,9 +376,39 @@ class FindReplaceDialog(QDialog):
 
         self.setLayout(main_layout)
 
+        # Search flags are built once and rebuilt only when an option changes
+        self.search_pattern_key = None
+        self.compiled_search_pattern = None
+        self.update_find_options()
+        # Uncomment if options are implemented
+        # self.case_checkbox.toggled.connect(self.update_find_options)
+        # self.whole_word_checkbox.toggled.connect(self.update_find_options)
+
         # Initialize search cursor
         self.cursor = None
 
+    def update_find_options(self):
+        """Rebuild the search flags from the option checkboxes."""
+        options = QTextDocument.FindFlags()
+        # Uncomment if options are implemented
+        # if self.case_checkbox.isChecked():
+        #     options |= QTextDocument.FindCaseSensitively
+        # if self.whole_word_checkbox.isChecked():
+        #     options |= QTextDocument.FindWholeWords
+        self.find_options = options
+
+    def search_pattern(self, search_text):
+        """Return the compiled pattern for the search text, reusing it while text and options are unchanged."""
+        key = (search_text, int(self.find_options))
+        if key != self.search_pattern_key:
+            pattern = re.escape(search_text)
+            if self.find_options & QTextDocument.FindWholeWords:
+                pattern = r'\b' + pattern + r'\b'
+            flags = 0 if self.find_options & QTextDocument.FindCaseSensitively else re.IGNORECASE
+            self.compiled_search_pattern = re.compile(pattern, flags)
+            self.search_pattern_key = key
+        return self.compiled_search_pattern
+
     def find_next(self):
         """Find the next occurrence of the search text."""
         search_text = self.find_input.text()
@@ -107,12 +416,7 @@ class FindReplaceDialog(QDialog):
             QMessageBox.warning(self, 'Find', 'Please enter text to find.')
             return
 
-        options = QTextDocument.FindFlags()
-        # Uncomment if options are implemented
-        # if self.case_checkbox.isChecked():
-        #     options |= QTextDocument.FindCaseSensitively
-        # if self.whole_word_checkbox.isChecked():
-        #     options |= QTextDocument.FindWholeWords
+        options = self.find_options
 
         # If no previous search, start from current cursor position
         if self.cursor is None:
@@ -145,12 +449,6 @@ class FindReplaceDialog(QDialog):
         # Check if current selection matches search text
         search_text = self.find_input.text()
         selected_text = self.cursor.selectedText()
-        options = QTextDocument.FindFlags()
-        # Uncomment if options are implemented
-        # if self.case_checkbox.isChecked():
-        #     options |= QTextDocument.FindCaseSensitively
-        # if self.whole_word_checkbox.isChecked():
-        #     options |= QTextDocument.FindWholeWords
 
         # Replace the text
         replace_text = self.replace_input.text()
@@ -170,40 +468,75 @@ class FindReplaceDialog(QDialog):
             return
 
         replace_text = self.replace_input.text()
-        options = QTextDocument.FindFlags()
-        # Uncomment if options are implemented
-        # if self.case_checkbox.isChecked():
-        #     options |= QTextDocument.FindCaseSensitively
-        # if self.whole_word_checkbox.isChecked():
-        #     options |= QTextDocument.FindWholeWords
 
-        document = self.parent.editor.document()
-        cursor = QTextCursor(document)
-        count = 0
+        # One scan with the cached pattern finds every match, in Markdown and rich text alike
+        count = self.substitute_all(self.search_pattern(search_text), lambda match: replace_text)
 
-        cursor.beginEditBlock()
-        while True:
-            # Find the text
-            found_cursor = document.find(search_text, cursor, options)
-            if found_cursor.isNull():
-                break
+        QMessageBox.information(self, 'Replace All', f'Replaced {count} occurrence(s).')
+        self.parent.editor.setFocus()
+        self.cursor = None  # Reset cursor after replacement
+
+        # Refresh highlights
+        self.highlight_all_occurrences()
 
-            # Replace the text
-            found_cursor.insertText(replace_text)
-            count += 1
+    def replace_list(self):
+        """Replace several terms at once, given as one 'find => replace' pair per line."""
+        pairs_text, ok = QInputDialog.getMultiLineText(
+            self, 'Replace List', 'One "find => replace" pair per line:'
+        )
+        if not ok:
+            return
 
-            # Move the main cursor to after the replacement to continue searching
-            cursor.setPosition(found_cursor.position())
+        replacements = {}
+        for line in pairs_text.splitlines():
+            find_text, separator, replace_text = line.partition('=>')
+            find_text = find_text.strip()
+            if separator and find_text:
+                replacements[find_text.lower()] = replace_text.strip()
+        if not replacements:
+            QMessageBox.warning(self, 'Replace List', 'Please enter at least one "find => replace" pair.')
+            return
 
-        cursor.endEditBlock()
+        # A single alternation (longest terms first) scans the text once for every term
+        terms = sorted(replacements, key=len, reverse=True)
+        pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+        count = self.substitute_all(
+            pattern, lambda match: replacements.get(match.group().lower(), match.group())
+        )
 
-        QMessageBox.information(self, 'Replace All', f'Replaced {count} occurrence(s).')
+        QMessageBox.information(self, 'Replace List', f'Replaced {count} occurrence(s).')
         self.parent.editor.setFocus()
         self.cursor = None  # Reset cursor after replacement
 
         # Refresh highlights
         self.highlight_all_occurrences()
 
+    def substitute_all(self, pattern, replacement):
+        """Replace every match of a compiled pattern in one pass; return the number replaced.
+
+        replacement is called with each match and returns the text to put in its place.
+        """
+        document = self.parent.editor.document()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        if self.parent.current_markdown is not None:
+            # Plain Markdown source can be rewritten as a whole
+            new_text, count = pattern.subn(replacement, document.toPlainText())
+            if count:
+                cursor.select(QTextCursor.Document)
+                cursor.insertText(new_text)
+        else:
+            # Raw text positions match document positions; replacing from the end keeps the
+            # earlier matches' positions valid and each match keeps its character format
+            matches = list(pattern.finditer(document.toRawText()))
+            for match in reversed(matches):
+                cursor.setPosition(match.start())
+                cursor.setPosition(match.end(), QTextCursor.KeepAnchor)
+                cursor.insertText(replacement(match))
+            count = len(matches)
+        cursor.endEditBlock()
+        return count
+
     def highlight_all_occurrences(self):
         """Highlight all occurrences of the search text in the document."""
         # Clear previous highlights
@@ -213,26 +546,20 @@ class FindReplaceDialog(QDialog):
         if not search_text:
             return  # Do nothing if search text is empty
 
-        options = QTextDocument.FindFlags()
-        # Uncomment if options are implemented
-        # if self.case_checkbox.isChecked():
-        #     options |= QTextDocument.FindCaseSensitively
-        # if self.whole_word_checkbox.isChecked():
-        #     options |= QTextDocument.FindWholeWords
-
         # Define the format for highlighting
         highlight_format = QTextCharFormat()
         highlight_format.setBackground(QColor("yellow"))
 
-        # Start from the beginning of the document
-        cursor = QTextCursor(self.parent.editor.document())
-        while True:
-            # Find the search text
-            cursor = self.parent.editor.document().find(search_text, cursor, options)
-            if cursor.isNull():
-                break
+        # Raw text positions match document positions, so one scan of the text finds every match
+        document = self.parent.editor.document()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        for match in self.search_pattern(search_text).finditer(document.toRawText()):
+            cursor.setPosition(match.start())
+            cursor.setPosition(match.end(), QTextCursor.KeepAnchor)
             # Apply the highlight format
             cursor.mergeCharFormat(highlight_format)
+        cursor.endEditBlock()
 
     def remove_highlight(self):
         """Remove all highlights from the document."""
@@ -253,20 +580,30 @@ class FindReplaceDialog(QDialog):
         event.accept()
 
 class ClarityEditor(QMainWindow):
+    markdown_converter = None  # Shared markdown.Markdown instance, built on first use
+
     def __init__(self):
         super().__init__()
 
         # Initialize state
         self.is_modified = False  # Track if the document is modified
         self.current_file_path = None  # Track the path of the currently opened file
+        self.saved_revision = None  # Document revision last saved to or opened from that file
+        self.saved_file_stat = None  # (mtime, size) of that file just after, to notice other programs' changes
         self.dark_mode = False  # Start with light mode
         self.current_markdown = None  # To track if we're editing a Markdown file
+        self.pdf_exports = []  # Keep running PDF export threads alive until they finish
+        self.file_load_worker = None  # The file currently being read in the background
+        self.updating_format_selection = False  # Guards update_format_selection against re-entry
+        self.shown_format_selection = None  # (char format, alignment) the toolbar currently reflects
+        self.error_box = None  # Reused for every error message, created on the first one
 
         # Create the main text editor with default font Charter
         self.editor = QTextEdit()
         self.editor.setFont(QFont('Charter', 14))
         self.editor.cursorPositionChanged.connect(self.update_format_selection)  # Update toolbar based on cursor
         self.editor.textChanged.connect(self.mark_as_modified)  # Track modifications
+        self.editor.currentCharFormatChanged.connect(self.reset_format_selection)  # Toolbar edits change the format
     
         # Create the Markdown preview widget
         self.preview_widget = QTextEdit()
@@ -289,64 +626,105 @@ class ClarityEditor(QMainWindow):
         # Set the splitter as the central widget
         self.setCentralWidget(self.splitter)
 
-        # Connect text change signal to update preview
-        self.editor.textChanged.connect(self.update_markdown_preview)
-
-        # Set default line and paragraph spacing
-        self.set_default_spacing()
+        # Connect text change signal to update preview, once typing pauses
+        self.preview_markdown_text = None  # Markdown text currently shown in the preview
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.update_markdown_preview)
+        self.editor.textChanged.connect(self.preview_timer.start)
+
+        # Spacing selectors apply their value only once the user stops changing it
+        self.line_spacing_timer = QTimer(self)
+        self.line_spacing_timer.setSingleShot(True)
+        self.line_spacing_timer.setInterval(SPACING_DEBOUNCE_MS)
+        self.line_spacing_timer.timeout.connect(self.apply_line_spacing)
+
+        self.paragraph_spacing_timer = QTimer(self)
+        self.paragraph_spacing_timer.setSingleShot(True)
+        self.paragraph_spacing_timer.setInterval(SPACING_DEBOUNCE_MS)
+        self.paragraph_spacing_timer.timeout.connect(self.apply_paragraph_spacing)
 
         # Create actions and toolbars
         self.create_actions()
         self.create_toolbars()
 
+        # Busy indicator shown in the status bar while a file is being opened
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 0)
+        self.load_progress.setMaximumWidth(150)
+        self.load_progress.setVisible(False)
+        self.statusBar().addPermanentWidget(self.load_progress)
+
         # Set up the main window
         self.setWindowTitle('Clarity Editor')
         self.setGeometry(100, 100, 1200, 900)
 
-        # Set default alignment
-        self.set_default_alignment()
+        # Set default line and paragraph spacing and alignment
+        self.apply_default_formatting()
 
-    def create_actions(self):
-        """Create actions for the toolbar and menu."""
+    # Toolbar/menu actions: (attribute, label, shortcut, slot, checkable)
+    # Standard keys are pre-parsed by Qt and follow platform conventions (Cmd on macOS)
+    ACTIONS = [
         # Formatting Actions
-        self.bold_action = QAction('Bold', self)
-        self.bold_action.triggered.connect(self.make_bold)
-        self.bold_action.setShortcut(QKeySequence("Ctrl+B"))
-        self.bold_action.setCheckable(True)
-
-        self.italic_action = QAction('Italic', self)
-        self.italic_action.triggered.connect(self.make_italic)
-        self.italic_action.setShortcut(QKeySequence("Ctrl+I"))
-        self.italic_action.setCheckable(True)
-
-        self.underline_action = QAction('Underline', self)
-        self.underline_action.triggered.connect(self.make_underline)
-        self.underline_action.setShortcut(QKeySequence("Ctrl+U"))
-        self.underline_action.setCheckable(True)
-
+        ('bold_action', 'Bold', QKeySequence.Bold, 'make_bold', True),
+        ('italic_action', 'Italic', QKeySequence.Italic, 'make_italic', True),
+        ('underline_action', 'Underline', QKeySequence.Underline, 'make_underline', True),
         # Alignment Actions
-        self.left_align_action = QAction('Left', self)
-        self.left_align_action.triggered.connect(self.align_left)
-        self.left_align_action.setCheckable(True)
-
-        self.center_align_action = QAction('Center', self)
-        self.center_align_action.triggered.connect(self.align_center)
-        self.center_align_action.setCheckable(True)
-
-        self.right_align_action = QAction('Right', self)
-        self.right_align_action.triggered.connect(self.align_right)
-        self.right_align_action.setCheckable(True)
+        ('left_align_action', 'Left', None, 'align_left', True),
+        ('center_align_action', 'Center', None, 'align_center', True),
+        ('right_align_action', 'Right', None, 'align_right', True),
+        ('justify_action', 'Justify', None, 'justify_text', True),
+        # List Actions
+        ('bullet_list_action', 'Bullets', None, 'insert_bullet_list', False),
+        ('number_list_action', 'Numbering', None, 'insert_numbered_list', False),
+        # Table Actions
+        ('insert_table_action', 'Insert Table', None, 'insert_table', False),
+        ('modify_table_action', 'Modify Table', None, 'modify_table', False),
+        # File Actions
+        ('new_action', 'New', QKeySequence.New, 'new_document', False),
+        ('open_action', 'Open', QKeySequence.Open, 'open_file', False),
+        ('save_action', 'Save', QKeySequence.Save, 'save_file', False),
+        ('save_as_action', 'Save As', 'Ctrl+Shift+S', 'save_file_as', False),
+        # Toggling dark mode View Actions
+        ('toggle_dark_mode_action', 'Toggle Dark Mode', None, 'toggle_dark_mode', False),
+        # Find and Replace Actions
+        ('find_action', 'Find', QKeySequence.Find, 'show_find_replace_dialog', False),
+        ('replace_action', 'Replace', 'Ctrl+R', 'show_find_replace_dialog', False),
+        # Markdown Actions
+        ('md_link_action', 'Link', None, 'insert_markdown_link', False),
+        ('md_image_action', 'Image', None, 'insert_markdown_image', False),
+    ]
 
-        self.justify_action = QAction('Justify', self)
-        self.justify_action.triggered.connect(self.justify_text)
-        self.justify_action.setCheckable(True)
+    # Markdown wrapping actions: (attribute, label, start syntax, end syntax)
+    MARKDOWN_SYNTAX_ACTIONS = [
+        ('md_bold_action', 'Bold', '**', '**'),
+        ('md_italic_action', 'Italic', '*', '*'),
+        ('md_code_action', 'Code', '`', '`'),
+    ]
 
-        # List Actions
-        self.bullet_list_action = QAction('Bullets', self)
-        self.bullet_list_action.triggered.connect(self.insert_bullet_list)
+    def create_actions(self):
+        """Create actions for the toolbar and menu."""
+        self.all_actions = []
+        for name, label, shortcut, slot, checkable in self.ACTIONS:
+            action = QAction(label, self)
+            action.triggered.connect(getattr(self, slot))
+            if shortcut is not None:
+                action.setShortcut(QKeySequence(shortcut))
+            action.setCheckable(checkable)
+            setattr(self, name, action)
+            self.all_actions.append(action)
+
+        for name, label, start_syntax, end_syntax in self.MARKDOWN_SYNTAX_ACTIONS:
+            action = QAction(label, self)
+            action.triggered.connect(
+                lambda checked=False, s=start_syntax, e=end_syntax: self.insert_markdown_syntax(s, e)
+            )
+            setattr(self, name, action)
+            self.all_actions.append(action)
 
-        self.number_list_action = QAction('Numbering', self)
-        self.number_list_action.triggered.connect(self.insert_numbered_list)
+        # Register every action with the window in one call
+        self.addActions(self.all_actions)
 
         # Font Selector
         self.font_selector = QComboBox(self)
@@ -382,59 +760,6 @@ class ClarityEditor(QMainWindow):
         self.paragraph_after_selector.setPrefix("After: ")
         self.paragraph_after_selector.valueChanged.connect(self.set_paragraph_spacing)
 
-        # Table Actions
-        self.insert_table_action = QAction('Insert Table', self)
-        self.insert_table_action.triggered.connect(self.insert_table)
-
-        self.modify_table_action = QAction('Modify Table', self)
-        self.modify_table_action.triggered.connect(self.modify_table)
-
-        # File Actions
-        self.new_action = QAction('New', self)
-        self.new_action.triggered.connect(self.new_document)
-        self.new_action.setShortcut(QKeySequence("Ctrl+N"))
-
-        self.open_action = QAction('Open', self)
-        self.open_action.triggered.connect(self.open_file)
-        self.open_action.setShortcut(QKeySequence("Ctrl+O"))
-
-        self.save_action = QAction('Save', self)
-        self.save_action.triggered.connect(self.save_file)
-        self.save_action.setShortcut(QKeySequence("Ctrl+S"))
-
-        self.save_as_action = QAction('Save As', self)
-        self.save_as_action.triggered.connect(self.save_file_as)
-        self.save_as_action.setShortcut(QKeySequence("Ctrl+Shift+S"))
-
-        # Toggling dark mode View Actions
-        self.toggle_dark_mode_action = QAction('Toggle Dark Mode', self)
-        self.toggle_dark_mode_action.triggered.connect(self.toggle_dark_mode)
-
-        # Find and Replace Actions
-        self.find_action = QAction('Find', self)
-        self.find_action.triggered.connect(self.show_find_replace_dialog)
-        self.find_action.setShortcut(QKeySequence("Ctrl+F"))
-
-        self.replace_action = QAction('Replace', self)
-        self.replace_action.triggered.connect(self.show_find_replace_dialog)
-        self.replace_action.setShortcut(QKeySequence("Ctrl+R"))
-
-        # Markdown Actions
-        self.md_bold_action = QAction('Bold', self)
-        self.md_bold_action.triggered.connect(lambda: self.insert_markdown_syntax('**', '**'))
-
-        self.md_italic_action = QAction('Italic', self)
-        self.md_italic_action.triggered.connect(lambda: self.insert_markdown_syntax('*', '*'))
-
-        self.md_code_action = QAction('Code', self)
-        self.md_code_action.triggered.connect(lambda: self.insert_markdown_syntax('`', '`'))
-
-        self.md_link_action = QAction('Link', self)
-        self.md_link_action.triggered.connect(self.insert_markdown_link)
-
-        self.md_image_action = QAction('Image', self)
-        self.md_image_action.triggered.connect(self.insert_markdown_image)
-
     def create_toolbars(self):
         """Create toolbars and add actions."""
         # Format Toolbar
@@ -443,17 +768,14 @@ class ClarityEditor(QMainWindow):
         self.format_toolbar.setAllowedAreas(Qt.TopToolBarArea | Qt.BottomToolBarArea)
         self.format_toolbar.setMovable(False)
 
-        self.format_toolbar.addAction(self.bold_action)
-        self.format_toolbar.addAction(self.italic_action)
-        self.format_toolbar.addAction(self.underline_action)
+        self.format_toolbar.addActions([self.bold_action, self.italic_action, self.underline_action])
         self.format_toolbar.addSeparator()
-        self.format_toolbar.addAction(self.left_align_action)
-        self.format_toolbar.addAction(self.center_align_action)
-        self.format_toolbar.addAction(self.right_align_action)
-        self.format_toolbar.addAction(self.justify_action)
+        self.format_toolbar.addActions([
+            self.left_align_action, self.center_align_action,
+            self.right_align_action, self.justify_action
+        ])
         self.format_toolbar.addSeparator()
-        self.format_toolbar.addAction(self.bullet_list_action)
-        self.format_toolbar.addAction(self.number_list_action)
+        self.format_toolbar.addActions([self.bullet_list_action, self.number_list_action])
         self.format_toolbar.addSeparator()
         self.format_toolbar.addWidget(QLabel("Font:"))
         self.format_toolbar.addWidget(self.font_selector)
@@ -474,16 +796,13 @@ class ClarityEditor(QMainWindow):
         self.additional_toolbar.addWidget(self.paragraph_before_selector)
         self.additional_toolbar.addWidget(self.paragraph_after_selector)
         self.additional_toolbar.addSeparator()
-        self.additional_toolbar.addAction(self.insert_table_action)
-        self.additional_toolbar.addAction(self.modify_table_action)
+        self.additional_toolbar.addActions([self.insert_table_action, self.modify_table_action])
         self.additional_toolbar.addSeparator()
-        self.additional_toolbar.addAction(self.new_action)
-        self.additional_toolbar.addAction(self.open_action)
-        self.additional_toolbar.addAction(self.save_action)
-        self.additional_toolbar.addAction(self.save_as_action)
+        self.additional_toolbar.addActions([
+            self.new_action, self.open_action, self.save_action, self.save_as_action
+        ])
         self.additional_toolbar.addSeparator()
-        self.additional_toolbar.addAction(self.find_action)
-        self.additional_toolbar.addAction(self.replace_action)
+        self.additional_toolbar.addActions([self.find_action, self.replace_action])
         self.additional_toolbar.addSeparator()
         self.additional_toolbar.addAction(self.toggle_dark_mode_action)
 
@@ -493,37 +812,42 @@ class ClarityEditor(QMainWindow):
         self.markdown_toolbar.setAllowedAreas(Qt.TopToolBarArea | Qt.BottomToolBarArea)
         self.markdown_toolbar.setMovable(False)
 
-        self.markdown_toolbar.addAction(self.md_bold_action)
-        self.markdown_toolbar.addAction(self.md_italic_action)
-        self.markdown_toolbar.addAction(self.md_code_action)
-        self.markdown_toolbar.addAction(self.md_link_action)
-        self.markdown_toolbar.addAction(self.md_image_action)
+        self.markdown_toolbar.addActions([
+            self.md_bold_action, self.md_italic_action, self.md_code_action,
+            self.md_link_action, self.md_image_action
+        ])
 
         # Start with the Markdown toolbar hidden
         self.markdown_toolbar.setVisible(False)
 
-    def set_default_spacing(self):
-        """Apply default line and paragraph spacing to the entire document."""
-        cursor = self.editor.textCursor()
-        cursor.select(QTextCursor.Document)
-        block_format = QTextBlockFormat()
-        block_format.setLineHeight(115, QTextBlockFormat.ProportionalHeight)  # 1.15 line spacing
-        block_format.setTopMargin(6)  # 6 points before paragraph
-        block_format.setBottomMargin(6)  # 6 points after paragraph
-        cursor.mergeBlockFormat(block_format)
-        self.editor.setTextCursor(cursor)
-
-    def set_default_alignment(self):
-        """Set the default text alignment to justified."""
-        cursor = self.editor.textCursor()
-        cursor.select(QTextCursor.Document)
-        block_format = QTextBlockFormat()
-        block_format.setAlignment(Qt.AlignJustify)
-        cursor.mergeBlockFormat(block_format)
-        self.editor.setTextCursor(cursor)
+    def apply_default_formatting(self):
+        """Apply the default spacing and alignment to the entire document in a single edit."""
+        # Reformatting is not a user edit, so keep textChanged from marking the document modified
+        self.editor.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(self.editor):
+                # Use a detached cursor so the user's cursor is not left selecting the whole document
+                cursor = QTextCursor(self.editor.document())
+                cursor.beginEditBlock()  # One undo step and one relayout for both formats
+                cursor.select(QTextCursor.Document)
+                self.set_default_spacing(cursor)
+                self.set_default_alignment(cursor)
+                cursor.endEditBlock()
+        finally:
+            self.editor.setUpdatesEnabled(True)
+
+    def set_default_spacing(self, cursor):
+        """Apply default line and paragraph spacing to cursor's selection."""
+        cursor.mergeBlockFormat(DEFAULT_SPACING_FORMAT)
+
+    def set_default_alignment(self, cursor):
+        """Set the default text alignment to justified for cursor's selection."""
+        cursor.mergeBlockFormat(DEFAULT_ALIGNMENT_FORMAT)
 
     def mark_as_modified(self):
         """Mark the document as modified."""
+        if self.is_modified:
+            return  # Already marked; keystrokes after the first need no title update
         self.is_modified = True
         if self.current_file_path:
             self.setWindowTitle(f"Clarity Editor - {os.path.basename(self.current_file_path)}*")
@@ -533,25 +857,28 @@ class ClarityEditor(QMainWindow):
     def make_bold(self):
         """Toggle bold formatting."""
         fmt = self.editor.currentCharFormat()
-        fmt.setFontWeight(QFont.Bold if not fmt.fontWeight() == QFont.Bold else QFont.Normal)
+        is_bold = fmt.fontWeight() == QFont.Bold
+        fmt.setFontWeight(QFont.Normal if is_bold else QFont.Bold)
         self.editor.setCurrentCharFormat(fmt)
-        self.bold_action.setChecked(fmt.fontWeight() == QFont.Bold)
+        self.bold_action.setChecked(not is_bold)
         self.editor.setFocus()
 
     def make_italic(self):
         """Toggle italic formatting."""
         fmt = self.editor.currentCharFormat()
-        fmt.setFontItalic(not fmt.fontItalic())
+        is_italic = fmt.fontItalic()
+        fmt.setFontItalic(not is_italic)
         self.editor.setCurrentCharFormat(fmt)
-        self.italic_action.setChecked(fmt.fontItalic())
+        self.italic_action.setChecked(not is_italic)
         self.editor.setFocus()
 
     def make_underline(self):
         """Toggle underline formatting."""
         fmt = self.editor.currentCharFormat()
-        fmt.setFontUnderline(not fmt.fontUnderline())
+        is_underlined = fmt.fontUnderline()
+        fmt.setFontUnderline(not is_underlined)
         self.editor.setCurrentCharFormat(fmt)
-        self.underline_action.setChecked(fmt.fontUnderline())
+        self.underline_action.setChecked(not is_underlined)
         self.editor.setFocus()
 
     def align_left(self):
@@ -585,6 +912,7 @@ class ClarityEditor(QMainWindow):
         block_format.setAlignment(alignment)
         cursor.setBlockFormat(block_format)
         self.editor.setTextCursor(cursor)
+        self.reset_format_selection()
 
     def update_alignment_buttons(self):
         """Update the checked state of alignment actions."""
@@ -629,9 +957,13 @@ class ClarityEditor(QMainWindow):
         self.editor.setFocus()
 
     def set_line_spacing(self, spacing_value):
+        """Schedule a line spacing change, coalescing rapid selector changes."""
+        self.line_spacing_timer.start()
+
+    def apply_line_spacing(self):
         """Set the line spacing."""
         try:
-            spacing = float(spacing_value) * 100
+            spacing = float(self.line_spacing_selector.currentText()) * 100
             cursor = self.editor.textCursor()
             block_format = cursor.blockFormat()
             block_format.setLineHeight(spacing, QTextBlockFormat.ProportionalHeight)
@@ -642,6 +974,10 @@ class ClarityEditor(QMainWindow):
             QMessageBox.warning(self, "Invalid Input", "Please enter a valid line spacing value.")
 
     def set_paragraph_spacing(self):
+        """Schedule a paragraph spacing change, coalescing rapid spinbox changes."""
+        self.paragraph_spacing_timer.start()
+
+    def apply_paragraph_spacing(self):
         """Set the paragraph spacing before and after."""
         cursor = self.editor.textCursor()
         block_format = cursor.blockFormat()
@@ -711,13 +1047,16 @@ class ClarityEditor(QMainWindow):
         """Save the current document. If it's a new document, prompt 'Save As'."""
         if self.current_file_path:
             try:
-                self.save_content(self.current_file_path)
+                if (self.editor.document().revision() != self.saved_revision
+                        or file_stat(self.current_file_path) != self.saved_file_stat):
+                    self.save_content(self.current_file_path)
+                # Otherwise the file still holds exactly what was saved; only the flag is stale
                 self.is_modified = False  # Mark as not modified after saving
                 self.statusBar().showMessage(f"Saved: {os.path.basename(self.current_file_path)}")
                 self.setWindowTitle(f"Clarity Editor - {os.path.basename(self.current_file_path)}")
                 return True
             except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save file: {str(e)}")
+                self.show_error("Error", f"Failed to save file: {str(e)}")
                 return False
         else:
             # Otherwise, save as a new file
@@ -762,78 +1101,74 @@ class ClarityEditor(QMainWindow):
                 self.setWindowTitle(f"Clarity Editor - {os.path.basename(self.current_file_path)}")
                 return True
             except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save file: {str(e)}")
+                self.show_error("Error", f"Failed to save file: {str(e)}")
                 return False
         else:
             return False  # User cancelled
 
     def save_content(self, file_name):
         """Save the content to the specified file."""
+        self.saved_revision = self.saved_file_stat = None
         if file_name.lower().endswith('.pdf'):
             self.save_as_pdf(file_name)
+            return  # The export finishes later and may still fail, so its content is not recorded
         elif file_name.lower().endswith('.html'):
-            content = self.editor.document().toHtml()
-            with open(file_name, 'w', encoding='utf-8') as f:
-                f.write(content)
-        elif file_name.lower().endswith('.md'):
-            markdown_text = self.editor.toPlainText()
-            with open(file_name, 'w', encoding='utf-8') as f:
-                f.write(markdown_text)
+            self.save_as_html(file_name)
         elif file_name.lower().endswith('.odt'):
             self.save_as_odt(file_name)
-        else:  # Save as plain text
-            content = self.editor.toPlainText()
-            with open(file_name, 'w', encoding='utf-8') as f:
-                f.write(content)
+        else:  # Save Markdown and plain text as-is
+            write_text_file(file_name, self.editor.toPlainText())
+        self.record_saved_state(file_name)
+
+    def record_saved_state(self, file_name):
+        """Remember that file_name holds the document as it is now, so an unchanged save can be skipped."""
+        self.saved_revision = self.editor.document().revision()  # Raised by every edit, formatting included
+        self.saved_file_stat = file_stat(file_name)
 
     def save_as_pdf(self, file_name):
-        """Save the document as a PDF (.pdf) file."""
-        printer = QPrinter(QPrinter.HighResolution)
-        printer.setOutputFormat(QPrinter.PdfFormat)
-        printer.setOutputFileName(file_name)
+        """Save the document as a PDF (.pdf) file on a worker thread."""
+        if any(worker.file_name == file_name for _, worker, _ in self.pdf_exports):
+            # Two threads printing to the same file would corrupt it
+            raise IOError("This PDF is still being exported. Please try again in a moment.")
+
         if self.current_markdown is not None:
             # Render the markdown to HTML and print it
-            markdown_text = self.editor.toPlainText()
-            html_content = markdown.markdown(
-                markdown_text,
-                extensions=[
-                    'extra',
-                    'codehilite',
-                    'toc',
-                    'nl2br',
-                ]
-            )
             doc = QTextDocument()
-            css = '''
-            <style>
-            /* Code block styling */
-            .codehilite {
-                background-color: #f8f8f8;
-                border: 1px solid #ccc;
-                padding: 5px;
-                overflow-x: auto;
-            }
-            /* Table styling */
-            table {
-                border-collapse: collapse;
-                width: 100%;
-            }
-            th, td {
-                border: 1px solid #ccc;
-                padding: 5px;
-            }
-            </style>
-            '''
-            doc.setHtml(css + html_content)
-            doc.print_(printer)
+            doc.setHtml(self.render_markdown_html(self.editor.toPlainText()))
+        else:
+            # Print a snapshot so the user can keep typing while the PDF is generated
+            doc = self.editor.document().clone()
+
+        thread = QThread(self)
+        worker = PdfExportWorker(doc, file_name)
+        doc.moveToThread(thread)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self.pdf_export_finished)
+        worker.finished.connect(thread.quit, Qt.DirectConnection)  # Stops the thread even while the GUI thread waits on it
+        job = (thread, worker, doc)
+        thread.finished.connect(lambda: self.pdf_exports.remove(job))
+        thread.finished.connect(thread.deleteLater)
+        self.pdf_exports.append(job)
+        self.statusBar().showMessage(f"Exporting PDF: {os.path.basename(file_name)}...")
+        thread.start()
+
+    def pdf_export_finished(self, file_name, error):
+        """Report the result of a background PDF export."""
+        if error:
+            self.show_error("Error", f"Failed to export PDF: {error}")
         else:
-            self.editor.document().print_(printer)
+            self.statusBar().showMessage(f"Saved: {os.path.basename(file_name)}")
+
+    def save_as_html(self, file_name):
+        """Save the document as an HTML file using QTextDocumentWriter."""
+        if not write_document(self.editor.document(), file_name, b'HTML'):
+            raise IOError("Failed to write HTML file.")
 
     def save_as_odt(self, file_name):
         """Save the document as an ODT file using QTextDocumentWriter."""
         try:
-            writer = QTextDocumentWriter(file_name, b'ODF')
-            success = writer.write(self.editor.document())
+            success = write_document(self.editor.document(), file_name, b'ODF')
             if not success:
                 raise IOError("Failed to write ODT file.")
         except Exception as e:
@@ -864,64 +1199,84 @@ class ClarityEditor(QMainWindow):
             elif reply == QMessageBox.Cancel:
                 return  # Do not proceed if cancel is selected
 
-        # Determine the file type and read the content
+        if file_name.lower().endswith('.odt'):
+            # Inform the user
+            QMessageBox.information(self, "ODT Support", "Opening ODT files will only extract plain text without formatting.")
+
+        # Read and decode the file on the thread pool; the editor is filled in file_loaded
+        worker = FileLoadWorker(file_name)
+        worker.signals.loaded.connect(self.file_loaded)
+        worker.signals.failed.connect(self.file_load_failed)
+        self.file_load_worker = worker
+        self.load_progress.setVisible(True)
+        self.statusBar().showMessage(f"Opening: {os.path.basename(file_name)}...")
+        QThreadPool.globalInstance().start(worker)
+
+    def file_loaded(self, file_name, content, cached_html):
+        """Show the content read by FileLoadWorker in the editor."""
+        if self.file_load_worker is None or self.file_load_worker.file_name != file_name:
+            return  # A newer open request has superseded this one
+        self.file_load_worker = None
+        self.load_progress.setVisible(False)
+
         try:
-            if file_name.lower().endswith('.md'):
-                with open(file_name, 'r', encoding='utf-8') as file:
-                    markdown_text = file.read()
-                    self.editor.setPlainText(markdown_text)
-                    self.current_markdown = markdown_text
-                    self.update_markdown_preview()
-                    # Show the Markdown toolbar
-                    self.markdown_toolbar.setVisible(True)
-                    # Adjust splitter sizes
-                    self.splitter.setSizes([600, 600])
-                self.setWindowTitle(f"Clarity Editor - {os.path.basename(file_name)}")
-            elif file_name.lower().endswith('.odt'):
-                # Inform the user
-                QMessageBox.information(self, "ODT Support", "Opening ODT files will only extract plain text without formatting.")
-                # Proceed to extract text
-                odt_doc = load(file_name)
-                all_paras = odt_doc.getElementsByType(text.P)
-                content = ''
-                for para in all_paras:
-                    content += teletype.extractText(para) + '\n'
-                self.editor.setPlainText(content)
-                self.current_markdown = None  # Reset current markdown
-                self.preview_widget.clear()
-                # Hide the Markdown toolbar
-                self.markdown_toolbar.setVisible(False)
-                # Adjust splitter sizes
-                self.splitter.setSizes([1200, 0])
-                self.setWindowTitle(f"Clarity Editor - {os.path.basename(file_name)}")
-            elif file_name.lower().endswith('.html'):
-                with open(file_name, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    self.editor.setHtml(content)
-                self.current_markdown = None  # Reset current markdown
-                self.preview_widget.clear()
-                # Hide the Markdown toolbar
-                self.markdown_toolbar.setVisible(False)
-                # Adjust splitter sizes
-                self.splitter.setSizes([1200, 0])
-                self.setWindowTitle(f"Clarity Editor - {os.path.basename(file_name)}")
-            else:
-                with open(file_name, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    self.editor.setPlainText(content)
-                self.current_markdown = None  # Reset current markdown
-                self.preview_widget.clear()
-                # Hide the Markdown toolbar
-                self.markdown_toolbar.setVisible(False)
-                # Adjust splitter sizes
-                self.splitter.setSizes([1200, 0])
-                self.setWindowTitle(f"Clarity Editor - {os.path.basename(file_name)}")
+            # Suspend repaints and editor signals so the load is laid out and reported once
+            self.editor.setUpdatesEnabled(False)
+            try:
+                with QSignalBlocker(self.editor):
+                    self.load_content(file_name, content, cached_html)
+            finally:
+                self.editor.setUpdatesEnabled(True)
+            # Loading is not an edit the user should be able to undo
+            self.editor.document().clearUndoRedoStacks()
+            self.update_format_selection()
 
             self.current_file_path = file_name  # Store the path of the currently opened file
+            self.record_saved_state(file_name)
             self.is_modified = False  # Mark as not modified initially
+            self.setWindowTitle(f"Clarity Editor - {os.path.basename(file_name)}")
             self.statusBar().showMessage(f"Opened: {os.path.basename(file_name)}")
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred while opening the file: {str(e)}")
+            self.show_error("Error", f"An error occurred while opening the file: {str(e)}")
+
+    def file_load_failed(self, file_name, error):
+        """Report a file that FileLoadWorker could not read."""
+        if self.file_load_worker is None or self.file_load_worker.file_name != file_name:
+            return
+        self.file_load_worker = None
+        self.load_progress.setVisible(False)
+        self.statusBar().clearMessage()
+        self.show_error("Error", f"An error occurred while opening the file: {error}")
+
+    def load_content(self, file_name, content, cached_html=''):
+        """Put file content into the editor according to the file's extension.
+
+        cached_html is a previously rendered preview of Markdown content, if one was found.
+        """
+        if file_name.lower().endswith('.md'):
+            self.editor.setPlainText(content)
+            self.current_markdown = content
+            if not cached_html:
+                cached_html = self.render_markdown_html(content)
+                write_cached_markdown_html(content, cached_html)
+            self.preview_markdown_text = content
+            self.preview_widget.setHtml(cached_html)
+            # Show the Markdown toolbar
+            self.markdown_toolbar.setVisible(True)
+            # Adjust splitter sizes
+            self.splitter.setSizes([600, 600])
+            return
+
+        if file_name.lower().endswith('.html'):
+            self.editor.setHtml(content)
+        else:  # Plain text, including text extracted from ODT files
+            self.editor.setPlainText(content)
+        self.current_markdown = None  # Reset current markdown
+        self.clear_markdown_preview()
+        # Hide the Markdown toolbar
+        self.markdown_toolbar.setVisible(False)
+        # Adjust splitter sizes
+        self.splitter.setSizes([1200, 0])
 
     def new_document(self):
         """Create a new document, prompting to save if there are unsaved changes."""
@@ -941,16 +1296,16 @@ class ClarityEditor(QMainWindow):
         # Clear the editor for a new document
         self.editor.clear()
         self.current_file_path = None  # Reset the current file path
+        self.saved_revision = self.saved_file_stat = None
         self.is_modified = False  # Reset modified status
         self.statusBar().showMessage("New document created.")
 
         # Reset formatting to defaults
-        self.set_default_alignment()
-        self.set_default_spacing()
+        self.apply_default_formatting()
 
         # Reset current markdown and clear preview
         self.current_markdown = None
-        self.preview_widget.clear()
+        self.clear_markdown_preview()
         # Hide the Markdown toolbar
         self.markdown_toolbar.setVisible(False)
         # Adjust splitter sizes
@@ -959,29 +1314,36 @@ class ClarityEditor(QMainWindow):
 
     def update_format_selection(self):
         """Update the format toolbar based on the current cursor position."""
+        if self.updating_format_selection:
+            return  # Ignore cursor moves caused by our own widget updates
+        self.updating_format_selection = True
         try:
             cursor = self.editor.textCursor()
             char_format = cursor.charFormat()
-            block_format = cursor.blockFormat()
+            alignment = cursor.blockFormat().alignment()
+
+            # Moving within text of the same format leaves the toolbar as it is
+            if self.shown_format_selection == (char_format, alignment):
+                return
+            self.shown_format_selection = (char_format, alignment)
 
             # Update font family
             current_font_family = char_format.fontFamily()
             if current_font_family:
                 index = self.font_selector.findText(current_font_family)
-                if index >= 0:
+                if index >= 0 and index != self.font_selector.currentIndex():
                     self.font_selector.blockSignals(True)
                     self.font_selector.setCurrentIndex(index)
                     self.font_selector.blockSignals(False)
 
             # Update font size
-            current_font_size = char_format.fontPointSize()
-            if current_font_size > 0:
+            current_font_size = int(char_format.fontPointSize())
+            if current_font_size > 0 and current_font_size != self.font_size_selector.value():
                 self.font_size_selector.blockSignals(True)
-                self.font_size_selector.setValue(int(current_font_size))
+                self.font_size_selector.setValue(current_font_size)
                 self.font_size_selector.blockSignals(False)
 
             # Update alignment buttons
-            alignment = block_format.alignment()
             self.left_align_action.setChecked(alignment == Qt.AlignLeft)
             self.center_align_action.setChecked(alignment == Qt.AlignCenter)
             self.right_align_action.setChecked(alignment == Qt.AlignRight)
@@ -993,7 +1355,21 @@ class ClarityEditor(QMainWindow):
             self.underline_action.setChecked(char_format.fontUnderline())
 
         except Exception as e:
-            QMessageBox.critical(self, "Format Selection Error", f"Failed to update format selection: {e}")
+            self.show_error("Format Selection Error", f"Failed to update format selection: {e}")
+        finally:
+            self.updating_format_selection = False
+
+    def show_error(self, title, message):
+        """Show an error message in the window's reusable error dialog."""
+        if self.error_box is None:
+            self.error_box = QMessageBox(QMessageBox.Critical, '', '', QMessageBox.Ok, self)
+        self.error_box.setWindowTitle(title)
+        self.error_box.setText(message)
+        self.error_box.exec_()
+
+    def reset_format_selection(self):
+        """Make the next update_format_selection refresh the toolbar unconditionally."""
+        self.shown_format_selection = None
 
     def closeEvent(self, event):
         """Prompt the user to save before exiting."""
@@ -1010,6 +1386,11 @@ class ClarityEditor(QMainWindow):
             elif reply == QMessageBox.Cancel:
                 event.ignore()
                 return
+        # Let running PDF exports finish, so no thread is destroyed while it is still writing its file
+        if self.pdf_exports:
+            self.statusBar().showMessage("Finishing PDF export...")
+            for thread, _, _ in list(self.pdf_exports):
+                thread.wait()
         event.accept()
 
     def toggle_dark_mode(self):
@@ -1026,6 +1407,7 @@ class ClarityEditor(QMainWindow):
     def set_dark_mode(self):
         """Switch to dark mode."""
         QApplication.setStyle("Fusion")
+        import qdarkstyle  # Imported on first use; light mode never needs it
         self.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
 
         # Set the editor's text color to white and background to dark
@@ -1057,43 +1439,55 @@ class ClarityEditor(QMainWindow):
         palette.setColor(QPalette.Base, QColor("white"))
         self.preview_widget.setPalette(palette)
 
+    @classmethod
+    def get_markdown_converter(cls):
+        """Return the shared Markdown converter, creating it on first use."""
+        if cls.markdown_converter is None:
+            # Imported here so sessions without Markdown files do not pay for it at startup
+            import markdown
+            cls.markdown_converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        return cls.markdown_converter
+
+    @classmethod
+    @lru_cache(maxsize=MARKDOWN_CACHE_SIZE)
+    def convert_markdown(cls, markdown_text):
+        """Convert Markdown text to HTML, reusing the result for recently seen text."""
+        return cls.get_markdown_converter().reset().convert(markdown_text)
+
+    @classmethod
+    @lru_cache(maxsize=MARKDOWN_CHUNK_CACHE_SIZE)
+    def convert_markdown_chunk(cls, chunk):
+        """Convert one chunk of a Markdown document, caching each chunk separately."""
+        return cls.get_markdown_converter().reset().convert(chunk)
+
+    def render_markdown_html(self, markdown_text):
+        """Convert Markdown text to styled HTML, re-parsing only chunks that changed."""
+        chunks = split_markdown_chunks(markdown_text)
+        if chunks is None:
+            html_content = self.convert_markdown(markdown_text)
+        else:
+            html_content = '\n'.join(self.convert_markdown_chunk(chunk) for chunk in chunks)
+            heading_ids = MARKDOWN_HEADING_ID_RE.findall(html_content)
+            if len(heading_ids) != len(set(heading_ids)):
+                # Repeated headings need the whole document to get their numbered ids
+                html_content = self.convert_markdown(markdown_text)
+        return MARKDOWN_CSS + html_content
+
     def update_markdown_preview(self):
         """Update the Markdown preview pane."""
         if self.current_markdown is not None:
             markdown_text = self.editor.toPlainText()
-            html_content = markdown.markdown(
-                markdown_text,
-                extensions=[
-                    'extra',
-                    'codehilite',
-                    'toc',
-                    'nl2br',
-                ]
-            )
-            # Add CSS styles
-            css = '''
-            <style>
-            /* Code block styling */
-            .codehilite {
-                background-color: #f8f8f8;
-                border: 1px solid #ccc;
-                padding: 5px;
-                overflow-x: auto;
-            }
-            /* Table styling */
-            table {
-                border-collapse: collapse;
-                width: 100%;
-            }
-            th, td {
-                border: 1px solid #ccc;
-                padding: 5px;
-            }
-            </style>
-            '''
-            self.preview_widget.setHtml(css + html_content)
+            if markdown_text == self.preview_markdown_text:
+                return  # Only formatting changed; the rendered preview is still current
+            self.preview_markdown_text = markdown_text
+            self.preview_widget.setHtml(self.render_markdown_html(markdown_text))
         else:
-            self.preview_widget.clear()
+            self.clear_markdown_preview()
+
+    def clear_markdown_preview(self):
+        """Empty the Markdown preview pane."""
+        self.preview_markdown_text = None
+        self.preview_widget.clear()
 
     def insert_markdown_syntax(self, start_syntax, end_syntax):
         """Insert Markdown syntax around the selected text."""